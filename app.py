@@ -16,4 +16,4 @@ if not actual_name:
 else:
     print(f"Fetching data for '{actual_name}' (closest match to '{pokemon_name}')...")
     data, species = pokeapi.fetch_pokemon(actual_name)
-    generate_card(data, species)
+    print(f"Saved card: {generate_card(data, species)}")
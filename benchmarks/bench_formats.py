@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Size and encode time of each card output format.
+
+Renders synthetic cards (one per type) and encodes them as png,
+png-optimized, png-palette and lossless webp, plus an 8x4 atlas sheet per
+format. No network needed.
+
+    python benchmarks/bench_formats.py --cards 64
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_render import sample_pokemon, sample_sprite  # noqa: E402
+from pokedex.card import CARD_SIZE, TYPE_COLORS, CardGenerator  # noqa: E402
+from pokedex.formats import FORMATS, AtlasWriter, compare_formats  # noqa: E402
+
+
+def bench_atlas(images, fmt):
+    with tempfile.TemporaryDirectory() as output_dir:
+        atlas = AtlasWriter(output_dir, CARD_SIZE, fmt=fmt)
+        start = time.perf_counter()
+        for i, image in enumerate(images):
+            atlas.add(f"card{i}", image)
+        atlas.close()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        return {"bytes": atlas.bytes_written, "mean_bytes": atlas.bytes_written / len(images),
+                "encode_ms": elapsed_ms, "mean_encode_ms": elapsed_ms / len(images)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=32)
+    parser.add_argument("--json", action="store_true", help="print the raw report as JSON")
+    args = parser.parse_args()
+
+    generator = CardGenerator()
+    sprite_bytes = sample_sprite()
+    types = list(TYPE_COLORS)
+    images = []
+    for i in range(args.cards):
+        data, species = sample_pokemon(number=i + 1, name=f"pokemon{i}", type_name=types[i % len(types)])
+        images.append(generator.render(data, species, sprite_bytes=sprite_bytes))
+
+    report = compare_formats(images)
+    for fmt in FORMATS:
+        report[f"atlas:{fmt}"] = bench_atlas(images, fmt)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    baseline = report["png"]["bytes"]
+    print(f"{'format':<20} {'KiB/card':>9} {'vs png':>7} {'ms/card':>8}")
+    for fmt, result in report.items():
+        print(f"{fmt:<20} {result['mean_bytes'] / 1024:>9.1f} {result['bytes'] / baseline:>6.0%} "
+              f"{result['mean_encode_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
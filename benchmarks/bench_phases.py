@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Per-phase card render timings plus a golden-image regression check.
+
+Renders one fixed synthetic Pokémon per entry in TYPE_COLORS and times the
+template, sprite composite, text and encode phases (from the renderer's
+trace spans). Each card is compared pixel by pixel against
+benchmarks/golden/<type>.png; the exit status is 1 if any differs by more
+than the tolerance. No network needed.
+
+    python benchmarks/bench_phases.py --iterations 50
+    python benchmarks/bench_phases.py --update-golden     # after an intended visual change
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PIL import Image, ImageChops  # noqa: E402
+from bench_render import sample_pokemon, sample_sprite  # noqa: E402
+from pokedex.card import TYPE_COLORS, CardGenerator  # noqa: E402
+from pokedex.formats import FORMATS, encode  # noqa: E402
+from pokedex.trace import tracer  # noqa: E402
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), "golden")
+PHASES = ("render.template", "render.sprite", "render.text", "encode")
+
+
+def fixture(index, type_name):
+    """The fixed input for one type: same sprite and stats, name and number from the type."""
+    return sample_pokemon(number=index + 1, name=f"{type_name}mon", type_name=type_name)
+
+
+def compare(image, golden, tolerance):
+    """Pixels whose channels differ from `golden` by more than `tolerance`; (count, max difference, mask)."""
+    if image.size != golden.size:
+        return image.width * image.height, 255, None
+    diff = ImageChops.difference(image.convert("RGB"), golden.convert("RGB"))
+    max_diff = max(high for _, high in diff.getextrema())
+    # A pixel is off if any of its channels is off
+    mask = None
+    for band in diff.split():
+        band = band.point(lambda value: 255 if value > tolerance else 0)
+        mask = band if mask is None else ImageChops.lighter(mask, band)
+    return mask.histogram()[255], max_diff, mask
+
+
+def bench_type(generator, index, type_name, sprite_bytes, iterations, fmt, cold_templates):
+    data, species = fixture(index, type_name)
+    tracer.reset()
+    encode_ms = []
+    for _ in range(iterations):
+        if cold_templates:
+            generator._templates.clear()
+        image = generator.render(data, species, sprite_bytes=sprite_bytes)
+        start = time.perf_counter()
+        encode(image, fmt)
+        encode_ms.append((time.perf_counter() - start) * 1000)
+    phases = {name: stage["mean_ms"] for name, stage in tracer.breakdown().items() if name in PHASES}
+    phases["encode"] = sum(encode_ms) / len(encode_ms)
+    return image, phases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20, help="renders per type")
+    parser.add_argument("--format", choices=list(FORMATS), default="png", help="format for the encode phase")
+    parser.add_argument("--cold-templates", action="store_true",
+                        help="drop the cached type templates before every render")
+    parser.add_argument("--tolerance", type=int, default=2,
+                        help="per-channel difference (0-255) still counted as equal")
+    parser.add_argument("--max-pixels", type=int, default=0,
+                        help="pixels allowed to exceed the tolerance per card")
+    parser.add_argument("--update-golden", action="store_true", help="overwrite the golden images with this run")
+    parser.add_argument("--diff-dir", help="write a mask of the differing pixels for each failing card here")
+    parser.add_argument("--json", action="store_true", help="print the raw report as JSON")
+    args = parser.parse_args()
+
+    generator = CardGenerator()
+    sprite_bytes = sample_sprite()
+    generator.warm()
+    tracer.enable()
+
+    report = {}
+    failures = 0
+    for index, type_name in enumerate(TYPE_COLORS):
+        image, phases = bench_type(generator, index, type_name, sprite_bytes, args.iterations, args.format,
+                                   args.cold_templates)
+        golden_path = os.path.join(GOLDEN_DIR, f"{type_name}.png")
+        entry = {"phases_ms": phases, "total_ms": sum(phases.values())}
+        if args.update_golden:
+            os.makedirs(GOLDEN_DIR, exist_ok=True)
+            image.save(golden_path, "PNG")
+            entry["golden"] = "updated"
+        elif not os.path.exists(golden_path):
+            entry["golden"] = "missing"
+            failures += 1
+        else:
+            with Image.open(golden_path) as golden:
+                differing, max_diff, mask = compare(image, golden, args.tolerance)
+            entry.update(golden="ok" if differing <= args.max_pixels else "FAIL",
+                         differing_pixels=differing, max_channel_diff=max_diff)
+            if differing > args.max_pixels:
+                failures += 1
+                if args.diff_dir and mask is not None:
+                    os.makedirs(args.diff_dir, exist_ok=True)
+                    mask.save(os.path.join(args.diff_dir, f"{type_name}.diff.png"))
+        report[type_name] = entry
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'type':<10} " + " ".join(f"{name.split('.')[-1]:>9}" for name in PHASES)
+              + f" {'total':>8}  golden")
+        for type_name, entry in report.items():
+            phases = entry["phases_ms"]
+            golden = entry["golden"]
+            if "differing_pixels" in entry and entry["differing_pixels"]:
+                golden += f" ({entry['differing_pixels']} px, max diff {entry['max_channel_diff']})"
+            print(f"{type_name:<10} " + " ".join(f"{phases.get(name, 0.0):>9.3f}" for name in PHASES)
+                  + f" {entry['total_ms']:>8.3f}  {golden}")
+        print("(mean ms per card)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Before/after benchmark for card text rendering.
+
+"before" reproduces the old text path (load the TTF and rasterize on every
+draw); "after" is the current renderer with the font registry and cached
+label glyph runs. Both render the same synthetic Pokémon, no network needed.
+
+    python benchmarks/bench_render.py --cards 200
+"""
+import argparse
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from PIL import Image, ImageDraw, ImageFont  # noqa: E402
+from pokedex.card import CardGenerator, get_font, get_glyph_run  # noqa: E402
+
+STATS = [("hp", 35), ("attack", 55), ("defense", 40),
+         ("special-attack", 50), ("special-defense", 50), ("speed", 90)]
+SPRITE_URL = "bench://sprite.png"
+
+
+def sample_pokemon(number=25, name="pikachu", type_name="electric"):
+    data = {
+        "name": name,
+        "id": number,
+        "types": [{"type": {"name": type_name}}],
+        "stats": [{"stat": {"name": stat}, "base_stat": value} for stat, value in STATS],
+        "sprites": {"front_default": SPRITE_URL},
+    }
+    return data, {"name": name}
+
+
+def sample_sprite():
+    sprite = Image.new("RGBA", (96, 96), (0, 0, 0, 0))
+    ImageDraw.Draw(sprite).ellipse((16, 16, 80, 80), fill=(250, 210, 40, 255))
+    buf = BytesIO()
+    sprite.save(buf, "PNG")
+    return buf.getvalue()
+
+
+class UncachedCardGenerator(CardGenerator):
+    """The pre-cache text path: load the TTF and rasterize on every draw."""
+
+    def paste_text(self, image, text, xy, font_size=20, fill=(0, 0, 0), align="left", bold=False):
+        font = ImageFont.truetype(self.font_path, font_size)
+        bbox = font.getbbox(text)
+        w = bbox[2] - bbox[0]
+        x, y = xy
+        if align == "center":
+            x -= w // 2
+        elif align == "right":
+            x -= w
+        ImageDraw.Draw(image).text((x, y), text, fill=fill, font=font)
+
+
+def bench(generator, cards, sprite_bytes):
+    timings = []
+    for i in range(cards):
+        data, species = sample_pokemon(number=i + 1, name=f"pokemon{i}")
+        start = time.perf_counter()
+        generator.render(data, species, sprite_bytes=sprite_bytes)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        "mean_ms": sum(timings) / len(timings) * 1000,
+        "p50_ms": timings[len(timings) // 2] * 1000,
+        "min_ms": timings[0] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=100)
+    args = parser.parse_args()
+
+    sprite_bytes = sample_sprite()
+    get_font.cache_clear()
+    get_glyph_run.cache_clear()
+    results = {
+        "before": bench(UncachedCardGenerator(), args.cards, sprite_bytes),
+        "after": bench(CardGenerator(), args.cards, sprite_bytes),
+    }
+    for label, result in results.items():
+        print(f"{label:>6}: mean {result['mean_ms']:.2f} ms  p50 {result['p50_ms']:.2f} ms  "
+              f"min {result['min_ms']:.2f} ms")
+    print(f"speedup: {results['before']['mean_ms'] / results['after']['mean_ms']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
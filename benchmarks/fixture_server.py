@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""Local PokeAPI stand-in that replays recorded (or synthetic) responses.
+
+Serves the endpoints the pokedex package uses:
+
+    /api/v2/pokemon?limit=N            name list
+    /api/v2/pokemon/<name or id>/      pokemon
+    /api/v2/pokemon-species/<id>/      species
+    /api/v2/evolution-chain/<id>/      evolution chain
+    /raw/<path>                        sprites
+
+with ETags, optional latency and error injection. Point the package at it with
+PKMNCLI_API_URL=http://127.0.0.1:<port>/api/v2/.
+
+Record real responses once (needs network), then replay them offline:
+
+    python benchmarks/fixture_server.py --record pikachu charizard gengar
+    python benchmarks/fixture_server.py --port 8765 --latency-ms 30 --error-rate 0.05
+
+Without recorded fixtures it serves a deterministic synthetic dex (--synthetic N).
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+API_PREFIX = "https://pokeapi.co/api/v2/"
+RAW_PREFIX = "https://raw.githubusercontent.com/PokeAPI/sprites/master/"
+
+TYPES = ["electric", "normal", "fire", "water", "ice", "rock", "flying", "grass",
+         "psychic", "ghost", "bug", "poison", "ground", "dragon", "steel", "fighting"]
+STAT_NAMES = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+SYLLABLES = ["pi", "ka", "chu", "char", "man", "der", "bul", "ba", "saur", "squi", "rt", "le",
+             "gen", "gar", "lu", "ca", "rio", "ray", "tyn", "amo", "mew", "eev", "vap", "eon"]
+
+
+class Dex:
+    """In-memory dex keyed by id: pokemon, species and evolution chain JSON plus sprite bytes by path."""
+
+    def __init__(self):
+        self.pokemon = {}
+        self.species = {}
+        self.chains = {}
+        self.by_name = {}
+        self.sprites = {}
+
+    def add(self, pokemon, species):
+        self.pokemon[pokemon["id"]] = pokemon
+        self.species[pokemon["id"]] = species
+        self.by_name[pokemon["name"]] = pokemon["id"]
+
+    @classmethod
+    def load(cls, directory=FIXTURES_DIR):
+        """Load recorded fixtures, or None if nothing has been recorded."""
+        pokemon_dir = os.path.join(directory, "pokemon")
+        if not os.path.isdir(pokemon_dir):
+            return None
+        dex = cls()
+        for filename in sorted(os.listdir(pokemon_dir)):
+            with open(os.path.join(pokemon_dir, filename), "r", encoding="utf-8") as f:
+                pokemon = json.load(f)
+            species_id = pokemon["species"]["url"].rstrip("/").rsplit("/", 1)[-1]
+            with open(os.path.join(directory, "species", species_id + ".json"), "r", encoding="utf-8") as f:
+                dex.add(pokemon, json.load(f))
+        chain_dir = os.path.join(directory, "evolution-chain")
+        for filename in sorted(os.listdir(chain_dir)) if os.path.isdir(chain_dir) else ():
+            with open(os.path.join(chain_dir, filename), "r", encoding="utf-8") as f:
+                chain = json.load(f)
+            dex.chains[chain["id"]] = chain
+        raw_dir = os.path.join(directory, "raw")
+        for root, _, files in os.walk(raw_dir):
+            for filename in files:
+                path = os.path.join(root, filename)
+                with open(path, "rb") as f:
+                    dex.sprites[os.path.relpath(path, raw_dir).replace(os.sep, "/")] = f.read()
+        return dex
+
+    @classmethod
+    def synthetic(cls, count=300, seed=0):
+        """A deterministic fake dex with `count` Pokémon and generated sprites.
+
+        Every three consecutive ids form one evolution family; the chain is
+        served under each member's id.
+        """
+        from PIL import Image, ImageDraw
+
+        rng = random.Random(seed)
+        dex = cls()
+        for number in range(1, count + 1):
+            name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+            while name in dex.by_name:
+                name += rng.choice(SYLLABLES)
+            type_name = TYPES[number % len(TYPES)]
+            sprite_path = f"sprites/pokemon/{number}.png"
+            pokemon = {
+                "id": number,
+                "name": name,
+                "height": rng.randint(2, 40),
+                "weight": rng.randint(10, 2000),
+                "base_experience": rng.randint(40, 300),
+                "types": [{"slot": 1, "type": {"name": type_name}}],
+                "abilities": [{"ability": {"name": rng.choice(["static", "blaze", "overgrow", "levitate"])}}],
+                "stats": [{"base_stat": rng.randint(20, 160), "stat": {"name": stat}} for stat in STAT_NAMES],
+                "species": {"name": name, "url": f"{API_PREFIX}pokemon-species/{number}/"},
+                "sprites": {"front_default": RAW_PREFIX + sprite_path},
+            }
+            species = {
+                "id": number,
+                "name": name,
+                "growth_rate": {"name": rng.choice(["slow", "medium", "fast", "medium-slow"])},
+                "evolution_chain": {"url": f"{API_PREFIX}evolution-chain/{number}/"},
+            }
+            dex.add(pokemon, species)
+
+            sprite = Image.new("RGBA", (96, 96), (0, 0, 0, 0))
+            color = tuple(rng.randint(40, 255) for _ in range(3)) + (255,)
+            ImageDraw.Draw(sprite).ellipse((16, 16, 80, 80), fill=color)
+            buf = BytesIO()
+            sprite.save(buf, "PNG")
+            dex.sprites[sprite_path] = buf.getvalue()
+
+        for first in range(1, count + 1, 3):
+            link = None
+            for number in reversed(range(first, min(first + 3, count + 1))):
+                link = {"species": {"name": dex.pokemon[number]["name"],
+                                    "url": f"{API_PREFIX}pokemon-species/{number}/"},
+                        "evolves_to": [link] if link else []}
+            for number in range(first, min(first + 3, count + 1)):
+                dex.chains[number] = {"id": number, "chain": link}
+        return dex
+
+
+def record(names, directory=FIXTURES_DIR):
+    """Download real PokeAPI responses for `names` into the fixtures directory."""
+    import requests
+
+    session = requests.Session()
+    for subdir in ("pokemon", "species", "evolution-chain", "raw"):
+        os.makedirs(os.path.join(directory, subdir), exist_ok=True)
+    for name in names:
+        pokemon = session.get(f"{API_PREFIX}pokemon/{name.lower()}", timeout=30).json()
+        species = session.get(pokemon["species"]["url"], timeout=30).json()
+        with open(os.path.join(directory, "pokemon", f"{pokemon['id']}.json"), "w", encoding="utf-8") as f:
+            json.dump(pokemon, f)
+        species_id = pokemon["species"]["url"].rstrip("/").rsplit("/", 1)[-1]
+        with open(os.path.join(directory, "species", species_id + ".json"), "w", encoding="utf-8") as f:
+            json.dump(species, f)
+        chain_url = (species.get("evolution_chain") or {}).get("url")
+        if chain_url:
+            chain = session.get(chain_url, timeout=30).json()
+            with open(os.path.join(directory, "evolution-chain", f"{chain['id']}.json"), "w", encoding="utf-8") as f:
+                json.dump(chain, f)
+        sprite_url = pokemon["sprites"]["front_default"]
+        if sprite_url and sprite_url.startswith(RAW_PREFIX):
+            path = os.path.join(directory, "raw", *sprite_url[len(RAW_PREFIX):].split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(session.get(sprite_url, timeout=30).content)
+        print(f"Recorded {pokemon['name']}")
+
+
+class FixtureServer:
+    """Threaded fixture server; use as a context manager or call start()/stop()."""
+
+    def __init__(self, dex=None, host="127.0.0.1", port=0, latency_ms=0.0, jitter_ms=0.0,
+                 error_rate=0.0, seed=0):
+        self.dex = dex or Dex.load() or Dex.synthetic()
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://{host}:{self.httpd.server_port}"
+        self.api_url = self.base_url + "/api/v2/"
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _rewrite(self, payload):
+        text = json.dumps(payload)
+        text = text.replace(API_PREFIX, self.api_url).replace(RAW_PREFIX, self.base_url + "/raw/")
+        return text.encode("utf-8")
+
+    def respond(self, path):
+        """(status, content type, body) for a request path."""
+        path, _, query = path.partition("?")
+        dex = self.dex
+        match = re.fullmatch(r"/api/v2/pokemon/?", path)
+        if match:
+            limit = int(dict(p.split("=", 1) for p in query.split("&") if "=" in p).get("limit", 20))
+            results = [{"name": dex.pokemon[i]["name"], "url": f"{API_PREFIX}pokemon/{i}/"}
+                       for i in sorted(dex.pokemon)[:limit]]
+            return 200, "application/json", self._rewrite({"count": len(dex.pokemon), "results": results})
+        match = re.fullmatch(r"/api/v2/pokemon/([^/]+)/?", path)
+        if match:
+            key = match.group(1).lower()
+            number = int(key) if key.isdigit() else dex.by_name.get(key)
+            if number in dex.pokemon:
+                return 200, "application/json", self._rewrite(dex.pokemon[number])
+        match = re.fullmatch(r"/api/v2/pokemon-species/(\d+)/?", path)
+        if match and int(match.group(1)) in dex.species:
+            return 200, "application/json", self._rewrite(dex.species[int(match.group(1))])
+        match = re.fullmatch(r"/api/v2/evolution-chain/(\d+)/?", path)
+        if match and int(match.group(1)) in dex.chains:
+            return 200, "application/json", self._rewrite(dex.chains[int(match.group(1))])
+        if path.startswith("/raw/") and path[len("/raw/"):] in dex.sprites:
+            return 200, "image/png", dex.sprites[path[len("/raw/"):]]
+        return 404, "application/json", b'{"detail": "Not found."}'
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                    delay = server.latency + server.random.uniform(0, server.jitter)
+                    fail = server.random.random() < server.error_rate
+                if delay:
+                    time.sleep(delay)
+                if fail:
+                    self._send(503, "application/json", b'{"detail": "Injected failure."}')
+                    return
+                status, content_type, body = server.respond(self.path)
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    self._send(304, content_type, b"", etag)
+                    return
+                self._send(status, content_type, body, etag if status == 200 else None)
+
+            def _send(self, status, content_type, body, etag=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="extra random latency, 0..N ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--synthetic", type=int, metavar="N",
+                        help="serve N synthetic Pokémon even if fixtures were recorded")
+    parser.add_argument("--record", nargs="+", metavar="NAME",
+                        help="record these Pokémon from pokeapi.co into benchmarks/fixtures/ and exit")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record)
+        return
+    dex = Dex.synthetic(args.synthetic) if args.synthetic else None
+    server = FixtureServer(dex, port=args.port, latency_ms=args.latency_ms,
+                           jitter_ms=args.jitter_ms, error_rate=args.error_rate)
+    print(f"Serving {len(server.dex.pokemon)} Pokémon; set PKMNCLI_API_URL={server.api_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
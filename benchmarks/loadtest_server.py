@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Load test for the card server: concurrent clients, p50/p99 latency.
+
+Start the server first (optionally against a local upstream, see README):
+
+    python -m pokedex.server --port 8000
+    python benchmarks/loadtest_server.py --url http://127.0.0.1:8000 \
+        --clients 16 --requests 2000 pikachu charizard gengar
+"""
+import argparse
+import json
+import random
+import threading
+import time
+
+import requests
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run(url, names, clients, total_requests, kind):
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    counter = iter(range(total_requests))
+
+    def client():
+        session = requests.Session()
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    return
+            name = random.choice(names)
+            path = f"/card/{name}.png" if kind == "card" else f"/pokemon/{name}.json"
+            start = time.perf_counter()
+            try:
+                res = session.get(url + path, timeout=60)
+                ok = res.status_code == 200
+                status = res.status_code
+            except requests.RequestException as e:
+                ok, status = False, type(e).__name__
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                if not ok:
+                    errors.append(status)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "clients": clients,
+        "wall_s": round(wall, 3),
+        "rps": round(len(latencies) / wall, 1) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", default=["pikachu", "charizard", "gengar", "lucario"])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--kind", choices=["card", "json"], default="card")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.url.rstrip("/"), args.names, args.clients, args.requests, args.kind), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""End-to-end benchmark suite against the local PokeAPI stand-in.
+
+Starts benchmarks/fixture_server.py in-process, points the package at it with
+a throwaway cache directory, and times cold/warm fetches, name search, card
+generation and ASCII rendering for single items and batches. Results are
+written as JSON with a stable layout so runs can be diffed:
+
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --compare bench.json   # flag regressions
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fixture_server import Dex, FixtureServer  # noqa: E402
+
+SCHEMA_VERSION = 1
+
+
+def summarize(samples, items=1):
+    """Timing summary in milliseconds; `items` is how many things each sample covered."""
+    samples = sorted(samples)
+    n = len(samples)
+    mean = sum(samples) / n
+    summary = {
+        "n": n,
+        "items": items,
+        "mean_ms": round(mean * 1000, 4),
+        "p50_ms": round(samples[n // 2] * 1000, 4),
+        "p99_ms": round(samples[min(n - 1, int(round(0.99 * (n - 1))))] * 1000, 4),
+        "min_ms": round(samples[0] * 1000, 4),
+    }
+    if items > 1:
+        summary["per_item_ms"] = round(mean / items * 1000, 4)
+    return summary
+
+
+def time_each(fn, args_list):
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def time_once(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return [time.perf_counter() - start]
+
+
+def typo(rng, word):
+    i = rng.randrange(len(word))
+    return word[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + word[i + 1:]
+
+
+def run_suite(server, singles, batch_size, searches):
+    # Imported here so PKMNCLI_API_URL / PKMNCLI_CACHE_DIR are already set
+    from pokedex import ascii_art
+    from pokedex.api import pokeapi
+    from pokedex.batch import BatchRunner
+    from pokedex.card import CardGenerator
+    from pokedex.finder import finder
+
+    rng = random.Random(0)
+    names = [server.dex.pokemon[i]["name"] for i in sorted(server.dex.pokemon)]
+    single_names = names[:singles]
+    batch_names = names[singles:singles + batch_size]
+    results = {}
+
+    # Fetching
+    fetch = pokeapi.fetch_pokemon
+    results["fetch_pokemon.cold.single"] = summarize(time_each(fetch, [(n,) for n in single_names]))
+    results["fetch_pokemon.warm.single"] = summarize(time_each(fetch, [(n,) for n in single_names]))
+
+    def fetch_batch(batch):
+        asyncio.run(pokeapi.fetch_many_bundles(batch))
+
+    results["fetch_pokemon.cold.batch"] = summarize(time_once(fetch_batch, batch_names), len(batch_names))
+    results["fetch_pokemon.warm.batch"] = summarize(time_once(fetch_batch, batch_names), len(batch_names))
+
+    # Name search
+    finder.name_list  # load the snapshot outside the timed region
+    queries = [typo(rng, rng.choice(names)) for _ in range(searches)]
+    results["find_closest.single"] = summarize(time_each(finder.find_closest, [(q,) for q in queries]))
+    results["find_closest.batch"] = summarize(time_once(finder.resolve_many, queries), len(queries))
+
+    # Card generation (data already cached, so this is render + save)
+    with tempfile.TemporaryDirectory() as output_dir:
+        generator = CardGenerator()
+        generator.output_dir = output_dir
+        bundles = [pokeapi.fetch_pokemon(n) for n in single_names]
+        with contextlib.redirect_stdout(io.StringIO()):
+            results["card.generate.single"] = summarize(time_each(generator.generate, bundles))
+        runner = BatchRunner(output_dir=output_dir)
+        results["card.generate.batch"] = summarize(time_once(runner.run, batch_names), len(batch_names))
+
+    # ASCII rendering, uncached output (sprites already decoded once)
+    sprite_urls = [pokeapi.fetch_pokemon(n)[0]["sprites"]["front_default"] for n in single_names]
+    for mode, width in (("gray", 40), ("gray", 160), ("truecolor", 80)):
+        def render(url):
+            ascii_art._cache.clear()
+            ascii_art.render_ascii(url, width, mode, raw=pokeapi.fetch_sprite(url))
+        results[f"ascii.{mode}.{width}.single"] = summarize(time_each(render, [(u,) for u in sprite_urls]))
+
+    def render_gallery(urls):
+        ascii_art._cache.clear()
+        for url in urls:
+            ascii_art.render_ascii(url, 40, "truecolor", raw=pokeapi.fetch_sprite(url))
+
+    batch_urls = [pokeapi.fetch_pokemon(n)[0]["sprites"]["front_default"] for n in batch_names]
+    results["ascii.truecolor.40.batch"] = summarize(time_once(render_gallery, batch_urls), len(batch_urls))
+    return results
+
+
+def compare(current, baseline, threshold):
+    """Print mean-time ratios against a baseline; returns True if anything regressed."""
+    regressed = False
+    for name, result in sorted(current["results"].items()):
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            print(f"{name:<32} {result['mean_ms']:>10.3f} ms   (new)")
+            continue
+        ratio = result["mean_ms"] / before["mean_ms"] if before["mean_ms"] else float("inf")
+        flag = "  REGRESSION" if ratio > 1 + threshold else ""
+        regressed = regressed or bool(flag)
+        print(f"{name:<32} {result['mean_ms']:>10.3f} ms   {ratio:5.2f}x{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--singles", type=int, default=20, help="items timed one by one")
+    parser.add_argument("--batch-size", type=int, default=100, help="items per batch case")
+    parser.add_argument("--searches", type=int, default=1000, help="fuzzy queries")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="fixture server latency")
+    parser.add_argument("--synthetic", type=int, help="use N synthetic Pokémon instead of recorded fixtures")
+    parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before flagging")
+    args = parser.parse_args()
+
+    dex = Dex.synthetic(args.synthetic) if args.synthetic else (Dex.load() or Dex.synthetic())
+    needed = args.singles + args.batch_size
+    if len(dex.pokemon) < needed:
+        parser.error(f"need at least {needed} Pokémon in the fixtures, have {len(dex.pokemon)}")
+
+    with FixtureServer(dex, latency_ms=args.latency_ms) as server, \
+            tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["PKMNCLI_API_URL"] = server.api_url
+        os.environ["PKMNCLI_CACHE_DIR"] = cache_dir
+        results = run_suite(server, args.singles, args.batch_size, args.searches)
+        upstream_requests = server.requests
+
+    report = {
+        "schema": SCHEMA_VERSION,
+        "config": {
+            "singles": args.singles,
+            "batch_size": args.batch_size,
+            "searches": args.searches,
+            "latency_ms": args.latency_ms,
+            "dex_size": len(dex.pokemon),
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "upstream_requests": upstream_requests,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,31 @@
-from PIL import Image
-import requests
-from io import BytesIO
-ASCII_CHARS = ['@', '%', '#', '*', '+', '=', '-', ':', '.', ' ']
-
-def fetch_pokemon_sprite_ascii(data, width=40):
-    sprite_url = data.get('sprites', {}).get('front_default')
-    if not sprite_url:
-        return None
-    try:
-        img_resp = requests.get(sprite_url)
-        img = Image.open(BytesIO(img_resp.content)).convert('L')
-        aspect_ratio = img.height / img.width
-        new_height = int(aspect_ratio * width * 0.55)
-        img = img.resize((width, new_height))
-        pixels = img.getdata()
-        ascii_str = ''
-        for i, pixel in enumerate(pixels):
-            ascii_str += ASCII_CHARS[pixel // 25]
-            if (i + 1) % width == 0:
-                ascii_str += '\n'
-        return ascii_str
-    except Exception:
-        return None
+import time
+STARTUP_T0 = time.perf_counter()
+
+from pokedex.ascii_art import sprite_to_ascii
+
+def fetch_pokemon_sprite_ascii(data, width=40, sprite_bytes=None, mode="gray"):
+    return sprite_to_ascii(data, width=width, mode=mode, sprite_bytes=sprite_bytes)
 #!/usr/bin/env python3
+import argparse
+import asyncio
+import atexit
+import json
+import os
 import random
 import sys
 from pokedex import api, card, finder
+from pokedex.cache import CACHE_DIR
+from pokedex.formats import FORMATS
+from pokedex.governor import governor
+from pokedex.models import PokemonRecord, as_record
+from pokedex.prefetch import MAX_ID, prefetcher
+from pokedex.trace import tracer
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 from rich.align import Align
 from rich.prompt import Prompt, Confirm
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 from rich.rule import Rule
-from rich.table import Table
-from rich.columns import Columns
-import time
 
 # Initialize Rich console with Pokemon-themed colors
 console = Console()
@@ -50,6 +40,10 @@ POKEMON_GREY = "#dedede"
 POKEMON_ORANGE = "#ff8c00"
 POKEMON_PURPLE = "#8b008b"
 
+# Time from process start to the first prompt, tracked in STARTUP_LOG
+STARTUP_BUDGET_MS = float(os.environ.get("PKMNCLI_STARTUP_BUDGET_MS", 300))
+STARTUP_LOG = os.path.join(CACHE_DIR, "startup.jsonl")
+
 def display_ascii_art():
     """Display PkmnCLI ASCII art with split color styling for PKM / N / CLI"""
 
@@ -82,23 +76,69 @@ def display_ascii_art():
     console.print(panel)
 
 def get_random_pokemon():
-    """Get a random Pokemon name from the API"""
+    """Get a random Pokemon name (resolved in the background, with its data already fetched)"""
     try:
-        # Get a random number between 1 and 1010 (approximate number of Pokemon)
-        random_id = random.randint(1, 1010)
-        
-        # Try to fetch Pokemon by ID first
-        import requests
-        res = requests.get(f"https://pokeapi.co/api/v2/pokemon/{random_id}")
-        if res.status_code == 200:
-            return res.json()["name"]
-        else:
-            # Fallback: pick from the loaded name list
-            return random.choice(finder.finder.name_list)
+        return prefetcher.take_random()
+    except ValueError:
+        # Not cached (offline mode): pick from the loaded name list
+        return random.choice(finder.finder.name_list)
     except Exception as e:
         console.print(f"[bold {POKEMON_RED}]⚠️  Error getting random Pokemon:[/bold {POKEMON_RED}] {e}")
         return "pikachu"  # Ultimate fallback
 
+def record_startup_time():
+    """Log time-to-first-prompt and warn when it exceeds the startup budget"""
+    elapsed_ms = (time.perf_counter() - STARTUP_T0) * 1000
+    entry = {
+        "timestamp": time.time(),
+        "time_to_prompt_ms": round(elapsed_ms, 2),
+        "budget_ms": STARTUP_BUDGET_MS,
+    }
+    try:
+        os.makedirs(os.path.dirname(STARTUP_LOG), exist_ok=True)
+        with open(STARTUP_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+    except OSError:
+        pass
+    if elapsed_ms > STARTUP_BUDGET_MS:
+        console.print(f"[dim {POKEMON_GREY}]⏱️  Startup took {elapsed_ms:.0f} ms (budget {STARTUP_BUDGET_MS:.0f} ms)[/dim {POKEMON_GREY}]")
+    return entry
+
+def print_profile(trace_file=None):
+    """Print the per-stage timing breakdown and counters, optionally writing a Chrome trace"""
+    from rich.table import Table
+
+    # stderr, so JSON-lines output from the scripted commands stays parseable
+    err_console = Console(stderr=True)
+    stages = Table(title="Profile", title_style=f"bold {POKEMON_YELLOW}", box=None, padding=(0, 1))
+    stages.add_column("Stage", style=f"bold {POKEMON_LIGHT_BLUE}")
+    for column in ("Calls", "Total ms", "Mean ms", "Max ms"):
+        stages.add_column(column, justify="right")
+    for name, stage in tracer.breakdown().items():
+        stages.add_row(name, str(stage["calls"]), f"{stage['total_ms']:.1f}",
+                       f"{stage['mean_ms']:.1f}", f"{stage['max_ms']:.1f}")
+    err_console.print(stages)
+    if tracer.counters:
+        counters = ", ".join(f"{name}={value}" for name, value in sorted(tracer.counters.items()))
+        err_console.print(f"[dim {POKEMON_GREY}]{counters}[/dim {POKEMON_GREY}]")
+    if tracer.counters["http.requests"]:
+        err_console.print(f"[dim {POKEMON_GREY}]{format_governor(governor.stats())}[/dim {POKEMON_GREY}]")
+    if trace_file:
+        tracer.write_chrome_trace(trace_file)
+        err_console.print(f"[dim {POKEMON_GREY}]Trace written to {trace_file}[/dim {POKEMON_GREY}]")
+
+def format_governor(stats):
+    """One-line summary of the request governor's window, queue and rate"""
+    text = (f"governor: window {stats['limit']}, {stats['in_flight']} in flight, {stats['queued']} queued, "
+            f"{stats['rate']:.1f} req/s")
+    if stats["max_rate"]:
+        text += f" (cap {stats['max_rate']:g})"
+    if stats["latency_ms"] is not None:
+        text += f", {stats['latency_ms']:.0f} ms latency"
+    if stats["throttled"]:
+        text += f", {stats['throttled']} throttled"
+    return text
+
 def create_stat_bar(stat_name, stat_value, max_value=255, color=POKEMON_LIGHT_BLUE):
     """Create a visual bar representation of a stat"""
     bar_width = 30
@@ -107,26 +147,30 @@ def create_stat_bar(stat_name, stat_value, max_value=255, color=POKEMON_LIGHT_BL
     bar = "█" * filled_width + "░" * (bar_width - filled_width)
     return f"[{color}]{bar}[/{color}] {stat_value:3d}"
 
-def display_pokemon_stats(data, species):
-    """Display Pokemon stats in a beautiful format with bars"""
+def display_pokemon_stats(data, species=None):
+    """Display Pokemon stats in a beautiful format with bars (takes a PokemonRecord or raw JSON)"""
+    from rich.table import Table
+    from rich.columns import Columns
+
+    record = as_record(data, species)
     
     # Basic Info Panel
     basic_info = Table(show_header=False, box=None, padding=(0, 1))
     basic_info.add_column(style=f"bold {POKEMON_YELLOW}", width=12)
     basic_info.add_column(style=f"bold {POKEMON_LIGHT_BLUE}")
     
-    name = data["name"].title()
-    pokemon_id = data["id"]
-    height = data["height"] / 10  # Convert to meters
-    weight = data["weight"] / 10  # Convert to kg
-    base_experience = data.get("base_experience", "Unknown")
+    name = record.name.title()
+    pokemon_id = record.id
+    height = record.height  # meters
+    weight = record.weight  # kg
+    base_experience = "Unknown" if record.base_experience is None else record.base_experience
     
     # Get types
-    types = [t["type"]["name"].title() for t in data["types"]]
+    types = [t.title() for t in record.types]
     type_str = " / ".join(types)
     
     # Get abilities
-    abilities = [a["ability"]["name"].title().replace("-", " ") for a in data["abilities"]]
+    abilities = [a.title().replace("-", " ") for a in record.abilities]
     ability_str = ", ".join(abilities)
     
     basic_info.add_row("🆔 ID:", f"#{pokemon_id}")
@@ -161,9 +205,7 @@ def display_pokemon_stats(data, species):
     }
     
     total_stats = 0
-    for stat in data["stats"]:
-        stat_name = stat["stat"]["name"]
-        stat_value = stat["base_stat"]
+    for stat_name, stat_value in record.stats:
         total_stats += stat_value
         
         display_name = stat_names.get(stat_name, stat_name.title())
@@ -222,7 +264,7 @@ def display_pokemon_stats(data, species):
         xp_info.append(f"This Pokémon gives {base_experience} base experience when defeated. ", style=POKEMON_LIGHT_BLUE)
         
         # XP Growth rate info (if available in species data)
-        growth_rate = species.get("growth_rate", {}).get("name", "unknown")
+        growth_rate = record.growth_rate or "unknown"
         if growth_rate != "unknown":
             xp_info.append(f"Growth Rate: {growth_rate.replace('-', ' ').title()}", style=f"bold {POKEMON_GREEN}")
         
@@ -262,8 +304,9 @@ def prompt_pokemon_name():
     
     return user_input
 
-def generate_pokemon_card_and_stats(pokemon_name):
+def generate_pokemon_card_and_stats(pokemon_name, ascii_width=40, ascii_mode="gray"):
     """Generate a Pokemon card with stats display and error handling"""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
     console.print(f"\n[bold {POKEMON_YELLOW}]🔎 Searching for '[{POKEMON_LIGHT_BLUE}]{pokemon_name}[/{POKEMON_LIGHT_BLUE}]'...[/bold {POKEMON_YELLOW}]")
     
     # Find closest match
@@ -289,26 +332,30 @@ def generate_pokemon_card_and_stats(pokemon_name):
         task = progress.add_task("Fetching...", total=None)
         
         try:
-            # Fetch Pokemon data
-            data, species = api.pokeapi.fetch_pokemon(actual_name)
-            
-            # Small delay to show the spinner
-            time.sleep(0.5)
-            
+            # Fetch Pokemon data, species and sprite (fetched once, used for ASCII art and card)
+            data, species, sprite_bytes = prefetcher.bundle(actual_name)
+            record = PokemonRecord.from_api(data, species)
         except Exception as e:
             console.print(f"[bold {POKEMON_RED}]❌ Error fetching data:[/bold {POKEMON_RED}] {e}")
             return False
+
+    # Draw the card and resolve the next random pick while the stats are read
+    rendered = prefetcher.render_card(record, sprite_bytes=sprite_bytes)
+    prefetcher.prepare_random()
     
     # Display Pokemon ASCII art first
-    ascii_art = fetch_pokemon_sprite_ascii(data)
+    with tracer.span("render.ascii", mode=ascii_mode, width=ascii_width):
+        ascii_art = fetch_pokemon_sprite_ascii(record, width=ascii_width, sprite_bytes=sprite_bytes, mode=ascii_mode)
     if ascii_art:
+        if ascii_mode != "gray":
+            ascii_art = Text.from_ansi(ascii_art)
         console.print(Panel(ascii_art, title=f"[bold {POKEMON_YELLOW}]ASCII Sprite[/bold {POKEMON_YELLOW}]", border_style=POKEMON_DEEP_BLUE, padding=(1,2)))
     else:
         console.print(f"[bold {POKEMON_RED}]No sprite available for ASCII art.[/bold {POKEMON_RED}]")
 
     # Display Pokemon stats
     console.print(Rule(f"[bold {POKEMON_LIGHT_BLUE}]📊 Pokemon Statistics 📊[/bold {POKEMON_LIGHT_BLUE}]", style=POKEMON_LIGHT_BLUE))
-    display_pokemon_stats(data, species)
+    display_pokemon_stats(record)
     
     # Ask if user wants to generate card too
     generate_card = Confirm.ask(
@@ -329,12 +376,13 @@ def generate_pokemon_card_and_stats(pokemon_name):
             task = progress.add_task("Generating...", total=None)
             
             try:
-                # Generate the card
-                card.generate(data, species)
-                
-                # Small delay to show the spinner
-                time.sleep(0.5)
-                
+                # Usually finished while the stats were on screen
+                encoded = rendered.result()
+                output_path = card.output_path(record.name)
+                os.makedirs(card.output_dir, exist_ok=True)
+                with tracer.span("card.save", path=output_path):
+                    with open(output_path, "wb") as f:
+                        f.write(encoded)
             except Exception as e:
                 console.print(f"[bold {POKEMON_RED}]❌ Error generating card:[/bold {POKEMON_RED}] {e}")
                 return True  # Return True because stats were shown successfully
@@ -345,7 +393,7 @@ def generate_pokemon_card_and_stats(pokemon_name):
         success_text.append(f"{actual_name.title()}", style=f"bold {POKEMON_LIGHT_BLUE}")
         success_text.append("! 🎉", style=f"bold {POKEMON_GREEN}")
         success_text.append(f"\n📁 Check the 'output' folder for your card: ", style=f"bold {POKEMON_YELLOW}")
-        success_text.append(f"{actual_name.lower()}.png", style=f"bold {POKEMON_DEEP_BLUE}")
+        success_text.append(os.path.basename(output_path), style=f"bold {POKEMON_DEEP_BLUE}")
         
         console.print(Panel(
             Align.center(success_text),
@@ -374,8 +422,424 @@ def show_menu():
         padding=(1, 2)
     ))
 
-def main():
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description="Pokemon stats & card generator")
+    parser.add_argument("--offline", action="store_true",
+                        help="answer purely from the local response cache, never touch the network")
+    parser.add_argument("--ascii-width", type=int, default=40,
+                        help="width of the sprite art in terminal columns")
+    parser.add_argument("--ascii-mode", choices=["gray", "truecolor", "256"], default="gray",
+                        help="ASCII ramp, or half-block art in 24-bit / 256 ANSI colors")
+    parser.add_argument("--measure-startup", action="store_true",
+                        help="print time-to-first-prompt as JSON and exit")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each fetch/render stage and print a breakdown on exit")
+    parser.add_argument("--trace-file", metavar="PATH",
+                        help="with --profile, also write a Chrome trace-event JSON file")
+
+    subparsers = parser.add_subparsers(dest="command")
+    batch = subparsers.add_parser("batch", help="generate cards for many Pokemon at once")
+    batch.add_argument("targets", nargs="*",
+                       help="names, ids, id ranges like 1-151, or @file with one target per line")
+    batch.add_argument("--file", action="append", default=[],
+                       help="read targets from a file (one per line)")
+    batch.add_argument("--output-dir", help="where to write the cards (default: output/)")
+    batch.add_argument("--fetch-workers", type=int, default=8,
+                       help="concurrent network fetches")
+    batch.add_argument("--render-workers", type=int,
+                       help="rendering processes (default: one per CPU core)")
+    batch.add_argument("--format", choices=list(FORMATS), default="png",
+                       help="image format: png, png-optimized, png-palette (quantized) or lossless webp")
+    batch.add_argument("--atlas", metavar="COLSxROWS", nargs="?", const="8x4",
+                       help="pack cards into sheets of COLSxROWS (default 8x4) plus an atlas.json index")
+    batch.add_argument("--force", action="store_true",
+                       help="re-render cards even if the output manifest says they are up to date")
+    batch.add_argument("--to", metavar="TARGET",
+                       help="stream cards into a .tar, .tar.gz or .zip archive; '-' writes them to stdout, "
+                            "'tar:-', 'tgz:-' or 'zip:-' an archive to stdout")
+
+    # Scripted commands: no prompts, spinners or delays; one JSON object per line on stdout
+    for command, help_text in (("show", "print stats as JSON lines"),
+                               ("card", "generate cards and print stats + card path as JSON lines")):
+        scripted = subparsers.add_parser(command, help=help_text)
+        scripted.add_argument("names", nargs="*",
+                              help="names, ids or id ranges (read from stdin when omitted)")
+        scripted.add_argument("--concurrency", type=int, default=8, help="requests in flight")
+        if command == "card":
+            scripted.add_argument("--output-dir", help="where to write the cards (default: output/)")
+            scripted.add_argument("--format", choices=list(FORMATS), default="png", help="image format")
+            scripted.add_argument("--force", action="store_true", help="re-render cards that are up to date")
+    montage = subparsers.add_parser("montage", help="draw many cards as one poster-sized grid PNG")
+    montage.add_argument("targets", nargs="*", help="names, ids, id ranges like 1-151, or @file")
+    montage.add_argument("--type", action="append", default=[], dest="types",
+                         help="add every synced Pokemon of this type (repeatable)")
+    montage.add_argument("--columns", type=int, default=10)
+    montage.add_argument("--card-width", type=int, help="scale each card to this width in pixels")
+    montage.add_argument("--output", default="montage.png", help="PNG file to write")
+    montage.add_argument("--concurrency", type=int, default=8, help="requests in flight")
+    evolution = subparsers.add_parser("evolution",
+                                      help="show a whole evolution family's stats side by side and draw its cards as one strip")
+    evolution.add_argument("name", help="any member of the family")
+    evolution.add_argument("--output", help="where to write the strip (default: output/<base form>-evolution.png)")
+    evolution.add_argument("--format", choices=list(FORMATS), default="png", help="image format")
+    evolution.add_argument("--no-card", action="store_true", help="only show the stats")
+    evolution.add_argument("--concurrency", type=int, default=16, help="requests in flight")
+    sync = subparsers.add_parser("sync", help="download the whole dex into a local SQLite store")
+    sync.add_argument("--concurrency", type=int, default=16, help="downloads in flight")
+    sync.add_argument("--revalidate", action="store_true",
+                      help="re-check every entry for changes, not only new ones and those older than a week")
+    query = subparsers.add_parser("query", help="filter and rank every synced Pokemon by stats")
+    query.add_argument("--where", action="append", default=[], metavar="COND",
+                       help="condition like 'total>600' or 'speed>=100' (repeatable, all must hold)")
+    query.add_argument("--type", action="append", default=[], dest="types",
+                       help="only Pokemon with this type (repeatable, any may match)")
+    query.add_argument("--sort", default="total", help="column to sort by (default: total)")
+    query.add_argument("--ascending", action="store_true", help="sort ascending instead of descending")
+    query.add_argument("--top", type=int, default=20, help="rows to show (0 for all)")
+    query.add_argument("--json", action="store_true", help="print JSON lines instead of a table")
+    query.add_argument("--rebuild", action="store_true", help="rebuild the stats table from the dex store first")
+    random_cmd = subparsers.add_parser("random", help="print random Pokemon as JSON lines")
+    random_cmd.add_argument("--count", type=int, default=1)
+    random_cmd.add_argument("--card", action="store_true", help="also generate their cards")
+    random_cmd.add_argument("--output-dir", help="where to write the cards (default: output/)")
+    random_cmd.add_argument("--concurrency", type=int, default=8, help="requests in flight")
+    return parser.parse_args(argv)
+
+async def stream_lookups(keyed_targets, render_cards=False, output_dir=None, concurrency=8, fmt="png",
+                         force=False):
+    """Look up targets concurrently, printing one JSON line per item as it completes"""
+    from pokedex.batch import render_item
+    from pokedex.formats import extension
+    from pokedex.manifest import OutputManifest, card_key
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    manifest = None
+    if render_cards:
+        output_dir = output_dir or card.output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        manifest = OutputManifest(output_dir)
+
+    async def process(target, key):
+        result = {"input": target}
+        try:
+            if key is None:
+                raise ValueError("no matching Pokémon")
+            data, species, sprite_bytes = await api.pokeapi.fetch_pokemon_bundle(key, semaphore)
+            record = PokemonRecord.from_api(data, species)
+            result.update(api.pokemon_summary(record))
+            if render_cards:
+                path = os.path.join(output_dir, f"{record.name.lower()}{extension(fmt)}")
+                inputs = card_key(record, sprite_bytes, fmt)
+                if not force and manifest.is_current(path, inputs):
+                    result["card"], result["skipped"] = path, True
+                else:
+                    result["card"] = await loop.run_in_executor(
+                        None, render_item, record, None, sprite_bytes, output_dir, fmt)
+                    manifest.update(path, inputs)
+        except Exception as e:
+            result["error"] = str(e)
+        print(json.dumps(result), flush=True)
+        return result
+
+    try:
+        return await asyncio.gather(*(process(target, key) for target, key in keyed_targets))
+    finally:
+        if manifest:
+            manifest.save()
+
+def run_scripted(args):
+    """Run the show / card / random commands non-interactively"""
+    from pokedex.batch import parse_targets, resolve_targets
+
+    if args.command == "random":
+        keyed_targets = [(str(i), str(i)) for i in (random.randint(1, MAX_ID) for _ in range(args.count))]
+        render_cards = args.card
+    else:
+        names = args.names or [line for line in sys.stdin.read().splitlines() if line.strip()]
+        keyed_targets = resolve_targets(parse_targets(names))
+        render_cards = args.command == "card"
+
+    results = asyncio.run(stream_lookups(keyed_targets, render_cards=render_cards,
+                                         output_dir=getattr(args, "output_dir", None),
+                                         concurrency=args.concurrency,
+                                         fmt=getattr(args, "format", "png"),
+                                         force=getattr(args, "force", False)))
+    return 1 if any("error" in result for result in results) else 0
+
+def run_sync(args):
+    """Download every pokemon, species and sprite into the local dex store"""
+    from rich.progress import Progress, BarColumn, TextColumn, MofNCompleteColumn
+    from pokedex.search import NameIndex
+    from pokedex.store import dex_store
+
+    if api.pokeapi.offline:
+        console.print(f"[bold {POKEMON_RED}]❌ Can't sync in offline mode.[/bold {POKEMON_RED}]")
+        return 2
+
+    with Progress(TextColumn(f"[bold {POKEMON_LIGHT_BLUE}]{{task.description}}"), BarColumn(),
+                  MofNCompleteColumn(), TextColumn(f"[dim {POKEMON_GREY}]{{task.fields[governor]}}"),
+                  console=console) as progress:
+        tasks = {}
+
+        def on_progress(stage, done, total):
+            if stage not in tasks:
+                tasks[stage] = progress.add_task(stage, total=total, governor="")
+            stats = governor.stats()
+            progress.update(tasks[stage], completed=done,
+                            governor=f"window {stats['limit']}, {stats['queued']} queued, {stats['rate']:.0f} req/s")
+
+        summary = dex_store.sync(finder.NAME_LIST_URL, concurrency=args.concurrency,
+                                 revalidate=args.revalidate, progress=on_progress)
+
+    # Rebuild the name snapshot so new Pokémon are searchable right away
+    finder.finder.save_snapshot(NameIndex(dex_store.names()))
+
+    summary_text = Text()
+    for stage in ("pokemon", "species", "chains", "sprites"):
+        counts = summary[stage]
+        summary_text.append(f"{stage:<8} {counts['fetched']} new/changed, {counts['unchanged']} unchanged",
+                            style=f"bold {POKEMON_GREEN}")
+        if counts["failed"]:
+            summary_text.append(f", {counts['failed']} failed", style=f"bold {POKEMON_RED}")
+        summary_text.append("\n")
+    totals = dex_store.counts()
+    summary_text.append(f"📦 {totals['pokemon']} Pokémon, {totals['species']} species, {totals['chains']} chains, "
+                        f"{totals['sprites']} sprites "
+                        f"in {dex_store.path} ({summary['elapsed']:.1f} s)", style=f"bold {POKEMON_LIGHT_BLUE}")
+    summary_text.append(f"\n{format_governor(governor.stats())}", style=f"dim {POKEMON_GREY}")
+    console.print(Panel(
+        summary_text,
+        title=f"[bold {POKEMON_YELLOW}]Sync Complete[/bold {POKEMON_YELLOW}]",
+        border_style=POKEMON_YELLOW,
+        padding=(1, 2)
+    ))
+    failed = sum(summary[stage]["failed"] for stage in ("pokemon", "species", "sprites"))
+    return 1 if failed else 0
+
+def run_query(args):
+    """Answer a stats query from the columnar stats table"""
+    from rich.table import Table
+    from pokedex.stats import STAT_COLUMNS, StatsTable, column_name, parse_condition
+
+    try:
+        conditions = [parse_condition(condition) for condition in args.where]
+        sort = column_name(args.sort)
+        table = StatsTable.open(rebuild=args.rebuild)
+    except ValueError as e:
+        console.print(f"[bold {POKEMON_RED}]❌ {e}[/bold {POKEMON_RED}]")
+        return 2
+
+    start = time.perf_counter()
+    rows = table.query(conditions, types=[t.lower() for t in args.types], sort=sort,
+                       descending=not args.ascending, limit=args.top or None)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        for index in rows:
+            print(json.dumps(table.row(index)))
+        return 0
+
+    result = Table(box=None, padding=(0, 1), header_style=f"bold {POKEMON_YELLOW}")
+    result.add_column("#", justify="right")
+    result.add_column("Name", style=f"bold {POKEMON_LIGHT_BLUE}")
+    result.add_column("Type")
+    labels = {"special-attack": "Sp.Atk", "special-defense": "Sp.Def"}
+    for column in STAT_COLUMNS + ["total"]:
+        result.add_column(labels.get(column, column.title()), justify="right",
+                          style=f"bold {POKEMON_GREEN}" if column == sort else None)
+    for index in rows:
+        row = table.row(index)
+        result.add_row(str(row["id"]), row["name"].title(), " / ".join(t.title() for t in row["types"]),
+                       *(str(row[column]) for column in STAT_COLUMNS + ["total"]))
+    console.print(result)
+    console.print(f"[dim {POKEMON_GREY}]{len(rows)} of {len(table)} Pokémon, query took {elapsed_ms:.2f} ms[/dim {POKEMON_GREY}]")
+    return 0
+
+def run_montage(args):
+    """Render a contact sheet of many cards, one row band at a time"""
+    from pokedex.batch import parse_targets, resolve_targets
+    from pokedex.montage import render_montage
+
+    keys = []
+    try:
+        if args.types:
+            from pokedex.stats import StatsTable
+
+            table = StatsTable.open()
+            rows = table.query(types=[t.lower() for t in args.types], sort="id", descending=False)
+            keys.extend(table.names[index] for index in rows)
+        for target, key in resolve_targets(parse_targets(args.targets)):
+            if key is None:
+                console.print(f"[bold {POKEMON_RED}]❌ {target}:[/bold {POKEMON_RED}] no matching Pokémon")
+            else:
+                keys.append(key)
+    except (OSError, ValueError) as e:
+        console.print(f"[bold {POKEMON_RED}]❌ {e}[/bold {POKEMON_RED}]")
+        return 2
+    if not keys:
+        console.print(f"[bold {POKEMON_RED}]❌ No Pokemon given. Pass names, ids, ranges or --type.[/bold {POKEMON_RED}]")
+        return 2
+
+    start = time.perf_counter()
+
+    def on_row(row, rows, failures):
+        for key, error in failures:
+            console.print(f"[bold {POKEMON_RED}]❌ {key}:[/bold {POKEMON_RED}] {error}")
+        console.print(f"[dim {POKEMON_GREY}]Row {row}/{rows}[/dim {POKEMON_GREY}]")
+
+    with open(args.output, "wb") as f:
+        result = render_montage(keys, f, columns=args.columns, card_width=args.card_width,
+                                concurrency=args.concurrency, on_row=on_row)
+    width, height = result["size"]
+    console.print(f"[bold {POKEMON_GREEN}]🖼️  {result['cards']} cards, {width}x{height} px → {args.output} "
+                  f"({time.perf_counter() - start:.1f} s)[/bold {POKEMON_GREEN}]")
+    return 1 if result["failed"] else 0
+
+def display_family_stats(stages):
+    """Show the stats of every family member side by side, best value per row highlighted"""
+    from rich.table import Table
+
+    records = [record for stage in stages for record, _ in stage]
+    table = Table(title=" → ".join(" / ".join(record.name.title() for record, _ in stage) for stage in stages),
+                  title_style=f"bold {POKEMON_YELLOW}", box=None, padding=(0, 2))
+    table.add_column("", style=f"bold {POKEMON_YELLOW}")
+    for record in records:
+        table.add_column(f"#{record.id} {record.name.title()}", style=f"bold {POKEMON_LIGHT_BLUE}", justify="right")
+
+    table.add_row("Type", *(" / ".join(t.title() for t in record.types) for record in records))
+    table.add_row("Height", *(f"{record.height:.1f} m" for record in records))
+    table.add_row("Weight", *(f"{record.weight:.1f} kg" for record in records))
+    table.add_row("Base XP", *(str(record.base_experience or "-") for record in records))
+    rows = [(name, [dict(record.stats).get(name, 0) for record in records]) for name, _ in records[0].stats]
+    rows.append(("total", [record.total for record in records]))
+    for name, values in rows:
+        best = max(values)
+        table.add_row(name.replace("-", " ").title(),
+                      *(f"[bold {POKEMON_GREEN}]{value}[/bold {POKEMON_GREEN}]" if value == best and len(values) > 1
+                        else str(value) for value in values))
+    console.print(table)
+
+def run_evolution(args):
+    """Fetch a whole evolution family at once, show its stats and draw its cards as one strip"""
+    from pokedex.batch import resolve_targets
+    from pokedex.evolution import compose_strip, family_records, render_family
+    from pokedex.formats import extension, save_image
+
+    (target, key), = resolve_targets([args.name])
+    if key is None:
+        console.print(f"[bold {POKEMON_RED}]❌ Couldn't find a match for '{target}'.[/bold {POKEMON_RED}]")
+        return 2
+    start = time.perf_counter()
+    try:
+        stages, failed = family_records(key, concurrency=args.concurrency)
+    except Exception as e:
+        console.print(f"[bold {POKEMON_RED}]❌ Error fetching data:[/bold {POKEMON_RED}] {e}")
+        return 1
+    for position, error in failed:
+        console.print(f"[bold {POKEMON_RED}]❌ {position}:[/bold {POKEMON_RED}] {error}")
+    display_family_stats(stages)
+
+    if not args.no_card:
+        strip = compose_strip(render_family(stages))
+        output = args.output or os.path.join(card.output_dir,
+                                             f"{stages[0][0][0].name.lower()}-evolution{extension(args.format)}")
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        save_image(strip, output, args.format)
+        console.print(f"[bold {POKEMON_GREEN}]🖼️  {sum(map(len, stages))} cards, {strip.width}x{strip.height} px → "
+                      f"{output}[/bold {POKEMON_GREEN}]")
+    console.print(f"[dim {POKEMON_GREY}]{time.perf_counter() - start:.2f} s[/dim {POKEMON_GREY}]")
+    return 1 if failed else 0
+
+def run_batch(args):
+    """Generate cards for every target given on the command line"""
+    from pokedex.batch import BatchRunner
+    from pokedex.writers import open_writer
+
+    # With --to -, stdout carries the cards, so the report goes to stderr
+    out = Console(stderr=True) if args.to and args.to.endswith("-") else console
+    specs = args.targets + [f"@{path}" for path in args.file]
+    if not specs:
+        out.print(f"[bold {POKEMON_RED}]❌ No Pokemon given. Pass names, ids, ranges or --file.[/bold {POKEMON_RED}]")
+        return 2
+
+    def on_result(result):
+        if result["error"]:
+            out.print(f"[bold {POKEMON_RED}]❌ {result['input']}:[/bold {POKEMON_RED}] {result['error']}")
+        elif result["skipped"]:
+            out.print(f"[dim {POKEMON_GREY}]⏭️  {result['name']} unchanged[/dim {POKEMON_GREY}]")
+        else:
+            out.print(f"[bold {POKEMON_GREEN}]✅ {result['name']}[/bold {POKEMON_GREEN}] [dim {POKEMON_GREY}]{result['path']}[/dim {POKEMON_GREY}]")
+
+    atlas = None
+    if args.atlas:
+        columns, _, rows = args.atlas.lower().partition("x")
+        if not (columns.isdigit() and rows.isdigit() and int(columns) and int(rows)):
+            out.print(f"[bold {POKEMON_RED}]❌ --atlas takes COLSxROWS, e.g. 8x4.[/bold {POKEMON_RED}]")
+            return 2
+        atlas = (int(columns), int(rows))
+    if atlas and args.to:
+        out.print(f"[bold {POKEMON_RED}]❌ --atlas and --to can't be combined.[/bold {POKEMON_RED}]")
+        return 2
+
+    writer = open_writer(args.to) if args.to else None
+    runner = BatchRunner(output_dir=args.output_dir, fetch_workers=args.fetch_workers,
+                         render_workers=args.render_workers, fmt=args.format, atlas=atlas, force=args.force,
+                         writer=writer)
+    try:
+        summary = runner.run(specs, on_result=on_result)
+    finally:
+        if writer:
+            writer.close()
+
+    summary_text = Text()
+    summary_text.append(f"🎴 {summary['succeeded']}/{summary['total']} cards generated", style=f"bold {POKEMON_GREEN}")
+    if summary["skipped"]:
+        summary_text.append(f" ({summary['skipped']} unchanged, skipped)", style=f"bold {POKEMON_GREY}")
+    if summary["failed"]:
+        summary_text.append(f", {summary['failed']} failed", style=f"bold {POKEMON_RED}")
+    summary_text.append(f"\n⏱️  {summary['elapsed']:.2f} s total, {summary['cards_per_second']:.1f} cards/s", style=f"bold {POKEMON_LIGHT_BLUE}")
+    rendered = summary["succeeded"] - summary["skipped"]
+    if rendered:
+        summary_text.append(f"\n💾 {summary['format']}: {summary['size'] / 1024:.1f} KiB written "
+                            f"({summary['size'] / rendered / 1024:.1f} KiB/card), "
+                            f"{summary['encode_ms']:.0f} ms encoding", style=f"bold {POKEMON_LIGHT_BLUE}")
+    if summary["atlas"]:
+        summary_text.append(f"\n🗺️  Atlas index: {summary['atlas']}", style=f"bold {POKEMON_LIGHT_BLUE}")
+    out.print(Panel(
+        summary_text,
+        title=f"[bold {POKEMON_YELLOW}]Batch Complete[/bold {POKEMON_YELLOW}]",
+        border_style=POKEMON_YELLOW,
+        padding=(1, 2)
+    ))
+    return 1 if summary["failed"] else 0
+
+def main(argv=None):
     """Main CLI application loop"""
+    args = parse_args(argv)
+    if args.offline:
+        api.pokeapi.offline = True
+    if args.profile or args.trace_file:
+        tracer.enable()
+        # atexit so the report also covers the sys.exit() paths below
+        atexit.register(print_profile, args.trace_file)
+    if args.command == "batch":
+        sys.exit(run_batch(args))
+    if args.command == "sync":
+        sys.exit(run_sync(args))
+    if args.command == "montage":
+        sys.exit(run_montage(args))
+    if args.command == "query":
+        sys.exit(run_query(args))
+    if args.command == "evolution":
+        sys.exit(run_evolution(args))
+    if args.command in ("show", "card", "random"):
+        sys.exit(run_scripted(args))
+    # Load the name list and resolve a random pick while the banner is shown and the user types
+    finder.finder.warm()
+    prefetcher.prepare_random()
+
     display_ascii_art()
     
     welcome_text = Text()
@@ -390,6 +854,11 @@ def main():
         padding=(1, 2)
     ))
     console.print()
+
+    startup = record_startup_time()
+    if args.measure_startup:
+        print(json.dumps(startup))
+        return
     
     while True:
         try:
@@ -397,7 +866,8 @@ def main():
             pokemon_name = prompt_pokemon_name()
             
             # Generate stats and optionally card
-            success = generate_pokemon_card_and_stats(pokemon_name)
+            success = generate_pokemon_card_and_stats(pokemon_name, ascii_width=args.ascii_width,
+                                                      ascii_mode=args.ascii_mode)
             
             if success:
                 # Show menu for next action
@@ -424,6 +894,7 @@ def main():
                             border_style=POKEMON_YELLOW,
                             padding=(1, 2)
                         ))
+                        prefetcher.close()
                         sys.exit(0)
             else:
                 # If lookup failed, ask if they want to try again
@@ -441,6 +912,7 @@ def main():
                         border_style="bright_yellow",
                         padding=(1, 2)
                     ))
+                    prefetcher.close()
                     sys.exit(0)
                 console.print(Rule("[bold bright_cyan]🔄 Trying Again 🔄[/bold bright_cyan]", style="bright_cyan"))
                     
@@ -456,6 +928,7 @@ def main():
                 border_style="bright_red",
                 padding=(1, 2)
             ))
+            prefetcher.close()
             sys.exit(0)
         except Exception as e:
             console.print(f"\n[bold red]❌ Unexpected error:[/bold red] {e}")
@@ -473,6 +946,7 @@ def main():
                     border_style="bright_yellow",
                     padding=(1, 2)
                 ))
+                prefetcher.close()
                 sys.exit(0)
 
 if __name__ == "__main__":
@@ -1,2 +1,7 @@
+"""Pokédex lookups and trading-card rendering.
+
+requests, Pillow and asyncio are imported inside the functions that use
+them, so `import pokedex` stays cheap for one-shot commands.
+"""
 from .card import card
 from .api import pokeapi
@@ -1,17 +1,260 @@
-import requests
+import atexit
+import os
+import threading
+import time
+from .cache import response_cache
+from .models import PokemonRecord, as_record
+from .sprites import sprite_store
+from .store import dex_store
+from .trace import tracer
+from .transport import transport
+
+# Point at a local PokeAPI stand-in with PKMNCLI_API_URL=http://127.0.0.1:8765/api/v2/
+API_ROOT = os.environ.get("PKMNCLI_API_URL", "https://pokeapi.co/api/v2/").rstrip("/") + "/"
+
+# How long exiting waits for background revalidations still in flight (seconds)
+REVALIDATE_WAIT = 3.0
 
 class PokeAPI:
-    BASE_URL = "https://pokeapi.co/api/v2/pokemon/"
+    BASE_URL = API_ROOT + "pokemon/"
 
-    def fetch_pokemon(self, name: str):
-        res = requests.get(self.BASE_URL + name.lower())
+    def __init__(self, cache=response_cache, offline=False, store=dex_store):
+        self.cache = cache
+        self.store = store
+        self.offline = offline
+        self._revalidating = set()
+        self._threads = []
+        self._wait_at_exit = False
+        self._lock = threading.Lock()
+
+    def get_json(self, url: str, ttl=None):
+        """Return the JSON body for `url`, served from the cache when possible.
+
+        Fresh entries are returned as-is. Stale entries are returned immediately
+        and revalidated in the background (stale-while-revalidate). In offline
+        mode only the cache is consulted. Returns None if the server answers
+        with anything other than 200/304.
+        """
+        entry = self.cache.get(url)
+        tracer.count("cache.miss" if entry is None else "cache.hit")
+        if self.offline:
+            if entry is None:
+                raise ValueError(f"'{url}' is not cached (offline mode).")
+            return entry["body"]
+        if entry is None:
+            return self._fetch(url, ttl=ttl)
+        if not self.cache.is_fresh(entry):
+            tracer.count("cache.stale")
+            self._revalidate_in_background(url, entry, ttl)
+        return entry["body"]
+
+    def _get_json_traced(self, stage, url):
+        with tracer.span(stage, url=url):
+            return self.get_json(url)
+
+    def _fetch(self, url, entry=None, ttl=None):
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        res = transport.get(url, headers=headers)
+        if res.status_code == 304 and entry:
+            tracer.count("cache.revalidated")
+            return self.cache.touch(url, entry)["body"]
         if res.status_code != 200:
+            return None
+        body = res.json()
+        self.cache.put(url, body, etag=res.headers.get("ETag"), ttl=ttl)
+        return body
+
+    def _revalidate_in_background(self, url, entry, ttl):
+        with self._lock:
+            if url in self._revalidating:
+                return
+            self._revalidating.add(url)
+
+        def revalidate():
+            try:
+                self._fetch(url, entry, ttl=ttl)
+            except Exception:
+                pass  # keep serving the stale copy
+            finally:
+                with self._lock:
+                    self._revalidating.discard(url)
+
+        thread = threading.Thread(target=revalidate, daemon=True)
+        with self._lock:
+            if not self._wait_at_exit:
+                # One-shot commands exit right after the lookup; give refreshes a chance to land
+                atexit.register(self.wait_for_revalidation)
+                self._wait_at_exit = True
+            self._threads = [t for t in self._threads if t.is_alive()] + [thread]
+        thread.start()
+
+    def wait_for_revalidation(self, timeout=REVALIDATE_WAIT):
+        """Wait up to `timeout` seconds in total for background revalidations to finish."""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+    def _from_store(self, name):
+        """(data, species) from the synced dex store, or None if the pokemon is not there.
+
+        A species missing from the store (e.g. after an interrupted sync) is
+        fetched like any other response.
+        """
+        with tracer.span("store.read", key=name):
+            data = self.store.pokemon(name)
+            if data is None:
+                return None
+            species = self.store.species(data["species"]["url"])
+        tracer.count("store.hit")
+        if species is None:
+            species = self._get_json_traced("fetch.species", data["species"]["url"])
+        return data, species
+
+    def fetch_pokemon(self, name: str):
+        local = self._from_store(name)
+        if local is not None:
+            return local
+        data = self._get_json_traced("fetch.pokemon", self.BASE_URL + name.lower())
+        if data is None:
             raise ValueError(f"Pokémon '{name}' not found.")
-        data = res.json()
 
         species_url = data["species"]["url"]
-        species = requests.get(species_url).json()
+        species = self._get_json_traced("fetch.species", species_url)
         return data, species
 
+    def fetch_record(self, name: str):
+        """Like fetch_pokemon, but parsed into a compact PokemonRecord."""
+        return PokemonRecord.from_api(*self.fetch_pokemon(name))
+
+    def fetch_sprite(self, url):
+        """Sprite bytes via the sprite store, or None if there is no sprite or it can't be fetched."""
+        if not url:
+            return None
+        try:
+            with tracer.span("fetch.sprite", url=url):
+                return self.store.sprite(url) or sprite_store.raw(url, fetch=not self.offline)
+        except Exception:
+            return None
+
+    async def _in_thread(self, semaphore, func, *args):
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        if semaphore is None:
+            return await loop.run_in_executor(None, func, *args)
+        async with semaphore:
+            return await loop.run_in_executor(None, func, *args)
+
+    async def fetch_pokemon_bundle(self, name: str, semaphore=None):
+        """Fetch (data, species, sprite_bytes) for one Pokémon.
+
+        The species and sprite requests both start as soon as the pokemon JSON
+        arrives and run concurrently, so latency is two round trips. Pass a
+        shared asyncio.Semaphore to bound in-flight requests across many
+        concurrent bundles. Pokémon in the synced dex store are read locally.
+        """
+        import asyncio
+
+        local = await self._in_thread(semaphore, self._from_store, name)
+        if local is not None:
+            sprite_bytes = await self._in_thread(semaphore, self.fetch_sprite, local[0]["sprites"]["front_default"])
+            return local + (sprite_bytes,)
+        data = await self._in_thread(semaphore, self._get_json_traced, "fetch.pokemon", self.BASE_URL + name.lower())
+        if data is None:
+            raise ValueError(f"Pokémon '{name}' not found.")
+
+        species, sprite_bytes = await asyncio.gather(
+            self._in_thread(semaphore, self._get_json_traced, "fetch.species", data["species"]["url"]),
+            self._in_thread(semaphore, self.fetch_sprite, data["sprites"]["front_default"]),
+        )
+        return data, species, sprite_bytes
+
+    def fetch_evolution_chain(self, species):
+        """The evolution chain JSON a species links to, or None if it has none."""
+        url = ((species or {}).get("evolution_chain") or {}).get("url")
+        if not url:
+            return None
+        local = self.store.chain(url)
+        if local is not None:
+            tracer.count("store.hit")
+            return local
+        return self._get_json_traced("fetch.evolution", url)
+
+    async def fetch_family(self, name: str, concurrency=16):
+        """Bundles for every member of `name`'s evolution family, grouped by stage.
+
+        Once the chain arrives all other members are fetched concurrently
+        (the bundle already fetched for `name` is reused), so a family costs
+        the chain request plus about one more lookup, whatever its size.
+        Returns [[(data, species, sprite_bytes) or exception, ...], ...] from
+        the base form on; a Pokémon that does not evolve is one stage of one.
+        """
+        import asyncio
+
+        semaphore = asyncio.Semaphore(concurrency)
+        bundle = await self.fetch_pokemon_bundle(name, semaphore)
+        chain = await self._in_thread(semaphore, self.fetch_evolution_chain, bundle[1])
+        if chain is None:
+            return [[bundle]]
+        stages = chain_stages(chain)
+
+        async def member(species_id):
+            if species_id == bundle[1].get("id"):
+                return bundle
+            # The default variety of a species shares its id
+            return await self.fetch_pokemon_bundle(str(species_id), semaphore)
+
+        ids = [species_id for stage in stages for _, species_id in stage]
+        results = iter(await asyncio.gather(*(member(i) for i in ids), return_exceptions=True))
+        return [[next(results) for _ in stage] for stage in stages]
+
+    async def fetch_many_bundles(self, names, concurrency=16):
+        """Fetch bundles for many Pokémon with at most `concurrency` requests in flight.
+
+        Returns one entry per name, in order: the bundle tuple, or the
+        exception raised while fetching it.
+        """
+        import asyncio
+
+        semaphore = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(
+            *(self.fetch_pokemon_bundle(name, semaphore) for name in names),
+            return_exceptions=True,
+        )
+
+def chain_stages(chain):
+    """(species name, species id) pairs of an evolution chain JSON, grouped by stage."""
+    stages = []
+    links = [chain["chain"]]
+    while links:
+        stages.append([(link["species"]["name"], int(link["species"]["url"].rstrip("/").rsplit("/", 1)[-1]))
+                       for link in links])
+        links = [child for link in links for child in link.get("evolves_to", ())]
+    return stages
+
+def pokemon_summary(data, species=None):
+    """The fields the CLI and server report about a Pokémon, as plain JSON types.
+
+    Takes a PokemonRecord or the raw pokemon and species JSON.
+    """
+    record = as_record(data, species)
+    stats = dict(record.stats)
+    return {
+        "name": record.name,
+        "id": record.id,
+        "types": list(record.types),
+        "stats": stats,
+        "total": sum(stats.values()),
+        "height": record.height,
+        "weight": record.weight,
+        "base_experience": record.base_experience,
+        "abilities": list(record.abilities),
+        "growth_rate": record.growth_rate,
+    }
+
 # Singleton instance
-pokeapi = PokeAPI()
+pokeapi = PokeAPI(offline=os.environ.get("PKMNCLI_OFFLINE") == "1")
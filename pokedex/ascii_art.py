@@ -0,0 +1,113 @@
+import threading
+from collections import OrderedDict
+from .api import pokeapi
+from .models import PokemonRecord
+from .sprites import sprite_store
+
+ASCII_CHARS = ['@', '%', '#', '*', '+', '=', '-', ':', '.', ' ']
+MODES = ("gray", "truecolor", "256")
+
+# Grayscale value -> ramp character, applied to the whole pixel buffer with bytes.translate
+_GRAY_TABLE = bytes(ord(ASCII_CHARS[min(value // 25, len(ASCII_CHARS) - 1)]) for value in range(256))
+# Channel value -> level on the xterm 6x6x6 color cube
+_CUBE_LEVELS = [round(value / 255 * 5) for value in range(256)]
+
+_RESET = "\x1b[0m"
+_CACHE_SIZE = 256
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def render_ascii(url, width=40, mode="gray", raw=None):
+    """Render the sprite at `url` as terminal art, cached per (url, width, mode).
+
+    "gray" maps luminance onto ASCII_CHARS. "truecolor" and "256" draw two
+    pixels per cell with upper half-blocks and ANSI colors.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown ASCII mode '{mode}', expected one of {', '.join(MODES)}.")
+    key = (url, width, mode)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    if mode == "gray":
+        art = _render_gray(sprite_store.ascii_sprite(url, width, raw=raw), width)
+    else:
+        art = _render_half_blocks(sprite_store.ansi_sprite(url, width, raw=raw), width, mode)
+
+    with _cache_lock:
+        _cache[key] = art
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return art
+
+
+def sprite_to_ascii(data, width=40, mode="gray", sprite_bytes=None):
+    """Terminal art for a Pokémon's front sprite (record or raw JSON), or None if it has none."""
+    if isinstance(data, PokemonRecord):
+        sprite_url = data.sprite_url
+    else:
+        sprite_url = data.get('sprites', {}).get('front_default')
+    if not sprite_url:
+        return None
+    if sprite_bytes is None:
+        sprite_bytes = pokeapi.fetch_sprite(sprite_url)
+    try:
+        return render_ascii(sprite_url, width, mode, raw=sprite_bytes)
+    except Exception:
+        return None
+
+
+def _render_gray(img, width):
+    chars = img.tobytes().translate(_GRAY_TABLE).decode("ascii")
+    return "".join(chars[i:i + width] + "\n" for i in range(0, len(chars), width))
+
+
+def _color_code(rgb, mode, layer):
+    # layer 38 = foreground, 48 = background
+    if mode == "truecolor":
+        return f"{layer};2;{rgb[0]};{rgb[1]};{rgb[2]}"
+    index = 16 + 36 * _CUBE_LEVELS[rgb[0]] + 6 * _CUBE_LEVELS[rgb[1]] + _CUBE_LEVELS[rgb[2]]
+    return f"{layer};5;{index}"
+
+
+def _half_block_cell(pixels, mode):
+    """(style, char) for one cell given its upper and lower RGBA pixels."""
+    fg = pixels[0:3] if pixels[3] >= 128 else None
+    bg = pixels[4:7] if pixels[7] >= 128 else None
+    if fg is None and bg is None:
+        return "", " "
+    if fg is None:
+        return _color_code(bg, mode, 38), "▄"
+    style = _color_code(fg, mode, 38)
+    if bg is not None:
+        style += ";" + _color_code(bg, mode, 48)
+    return style, "▀"
+
+
+def _render_half_blocks(img, width, mode):
+    data = img.tobytes()
+    row_bytes = width * 4
+    # Sprites use few colors, so most cells repeat an earlier (upper, lower) pair
+    cell_styles = {}
+    lines = []
+    for top in range(0, img.height, 2):
+        upper = data[top * row_bytes:(top + 1) * row_bytes]
+        lower = data[(top + 1) * row_bytes:(top + 2) * row_bytes]
+        cells = []
+        previous = None
+        for x in range(0, row_bytes, 4):
+            pixels = upper[x:x + 4] + lower[x:x + 4]
+            cell = cell_styles.get(pixels)
+            if cell is None:
+                cell = cell_styles[pixels] = _half_block_cell(pixels, mode)
+            style, char = cell
+            # Only emit an escape sequence when the style changes
+            if style != previous:
+                cells.append(f"\x1b[0;{style}m" if style else _RESET)
+                previous = style
+            cells.append(char)
+        lines.append("".join(cells) + _RESET + "\n")
+    return "".join(lines)
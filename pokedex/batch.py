@@ -0,0 +1,204 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from .api import pokeapi
+from .card import DEFAULT_OUTPUT_DIR
+from .finder import finder
+from .formats import DEFAULT_FORMAT, AtlasWriter, encode, extension, save_image
+from .manifest import OutputManifest, card_key
+from .models import PokemonRecord, as_record
+from .trace import tracer
+
+
+def parse_targets(specs):
+    """Expand names, ids, id ranges ("1-151") and @files into lookup targets.
+
+    Files list one target per line; blank lines and `#` comments are skipped.
+    """
+    targets = []
+    for spec in specs:
+        spec = spec.strip()
+        if not spec or spec.startswith("#"):
+            continue
+        if spec.startswith("@"):
+            with open(spec[1:], "r", encoding="utf-8") as f:
+                targets.extend(parse_targets(f.read().splitlines()))
+            continue
+        start, sep, end = spec.partition("-")
+        if sep and start.isdigit() and end.isdigit():
+            targets.extend(str(i) for i in range(int(start), int(end) + 1))
+        else:
+            targets.append(spec.lower())
+    return targets
+
+
+def resolve_targets(targets):
+    """Pair each target with its lookup key: ids pass through, names go through the finder."""
+    names = [target for target in targets if not target.isdigit()]
+    resolved = finder.resolve_many(names) if names else {}
+    return [(target, target if target.isdigit() else resolved[target]) for target in targets]
+
+
+def init_render_worker():
+    """Load fonts and label glyphs once per worker process instead of per card."""
+    from .card import card
+
+    card.warm()
+
+
+def render_item(data, species, sprite_bytes, output_dir, fmt=DEFAULT_FORMAT):
+    """Render one card and save it; runs inside a worker process.
+
+    `data` may be a PokemonRecord (with `species` None), which is far cheaper
+    to send to a worker than the raw JSON.
+    """
+    return render_to_file(data, species, sprite_bytes, output_dir, fmt)["path"]
+
+
+def render_to_file(data, species, sprite_bytes, output_dir, fmt=DEFAULT_FORMAT):
+    """Like render_item, but returns {"path", "size", "encode_ms"} (size in bytes)."""
+    from .card import card
+
+    record = as_record(data, species)
+    image = card.render(record, sprite_bytes=sprite_bytes)
+    output_path = os.path.join(output_dir, f"{record.name.lower()}{extension(fmt)}")
+    start = time.perf_counter()
+    with tracer.span("card.save", path=output_path, format=fmt):
+        save_image(image, output_path, fmt)
+    encode_ms = (time.perf_counter() - start) * 1000
+    return {"path": output_path, "size": os.path.getsize(output_path), "encode_ms": encode_ms}
+
+
+def render_encoded(data, species, sprite_bytes, fmt=DEFAULT_FORMAT):
+    """Render and encode one card in a worker process; returns {"data", "encode_ms"}."""
+    from .card import card
+
+    image = card.render(as_record(data, species), sprite_bytes=sprite_bytes)
+    start = time.perf_counter()
+    data = encode(image, fmt)
+    return {"data": data, "encode_ms": (time.perf_counter() - start) * 1000}
+
+
+def render_image(data, species, sprite_bytes):
+    """Render one card in a worker process and send the image back (for atlas sheets)."""
+    from .card import card
+
+    return card.render(as_record(data, species), sprite_bytes=sprite_bytes)
+
+
+class BatchRunner:
+    """Generate many cards at once.
+
+    Network fetches run as concurrent asyncio bundles (at most `fetch_workers`
+    requests in flight) and each card is handed to a process pool sized to the
+    machine as soon as its data arrives. A failing item is reported and the
+    rest of the run carries on. Cards are saved one file each in `fmt`, or
+    with `atlas=(columns, rows)` packed into sheets plus an atlas.json index,
+    or handed to a `writer` (see pokedex.writers) instead of `output_dir`.
+    Single-file cards in `output_dir` whose inputs, sprite and renderer version match the
+    output manifest are skipped unless `force` is set.
+    """
+
+    def __init__(self, output_dir=None, fetch_workers=8, render_workers=None, fmt=DEFAULT_FORMAT, atlas=None,
+                 force=False, writer=None):
+        self.output_dir = output_dir or DEFAULT_OUTPUT_DIR
+        self.fetch_workers = fetch_workers
+        self.render_workers = render_workers or os.cpu_count() or 1
+        self.fmt = fmt
+        self.atlas = atlas
+        self.force = force
+        self.writer = writer
+
+    def run(self, specs, on_result=None):
+        """Render every target in `specs` and return a summary dict.
+
+        `on_result` is called with each item's result dict as soon as it
+        finishes: {"input", "name", "path", "size", "encode_ms", "skipped", "error"}.
+        In atlas mode "path" is the sheet and the sizes are reported once,
+        in the summary.
+        """
+        from .card import CARD_SIZE
+
+        start = time.perf_counter()
+        results = []
+
+        def report(target, name=None, path=None, error=None, size=None, encode_ms=None, skipped=False):
+            result = {"input": target, "name": name, "path": path, "size": size,
+                      "encode_ms": encode_ms, "skipped": skipped, "error": error}
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+        targets = parse_targets(specs)
+        atlas = manifest = None
+        if self.writer is None:
+            os.makedirs(self.output_dir, exist_ok=True)
+            atlas = AtlasWriter(self.output_dir, CARD_SIZE, *self.atlas, fmt=self.fmt) if self.atlas else None
+            manifest = None if atlas else OutputManifest(self.output_dir)
+        try:
+            with ProcessPoolExecutor(self.render_workers, initializer=init_render_worker) as render_pool:
+                asyncio.run(self._run_all(resolve_targets(targets), render_pool, report, atlas, manifest))
+        finally:
+            if manifest:
+                manifest.save()
+        atlas_index = atlas.close() if atlas else None
+
+        elapsed = time.perf_counter() - start
+        succeeded = sum(1 for result in results if result["error"] is None)
+        return {
+            "total": len(results),
+            "succeeded": succeeded,
+            "skipped": sum(1 for result in results if result["skipped"]),
+            "failed": len(results) - succeeded,
+            "elapsed": elapsed,
+            "cards_per_second": succeeded / elapsed if elapsed else 0.0,
+            "format": self.fmt,
+            "size": atlas.bytes_written if atlas else sum(r["size"] or 0 for r in results),
+            "encode_ms": atlas.encode_ms if atlas else sum(r["encode_ms"] or 0 for r in results),
+            "atlas": atlas_index,
+            "results": results,
+        }
+
+    async def _run_all(self, keyed_targets, render_pool, report, atlas=None, manifest=None):
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.fetch_workers)
+
+        async def process(target, key):
+            if key is None:
+                report(target, error="no matching Pokémon")
+                return
+            try:
+                data, species, sprite_bytes = await pokeapi.fetch_pokemon_bundle(key, semaphore)
+                record = PokemonRecord.from_api(data, species)
+            except Exception as e:
+                report(target, error=f"fetch failed: {e}")
+                return
+            if manifest is not None:
+                path = os.path.join(self.output_dir, f"{record.name.lower()}{extension(self.fmt)}")
+                inputs = card_key(record, sprite_bytes, self.fmt)
+                if not self.force and manifest.is_current(path, inputs):
+                    report(target, name=record.name, path=path, skipped=True)
+                    return
+            try:
+                if atlas:
+                    image = await loop.run_in_executor(render_pool, render_image, record, None, sprite_bytes)
+                    # Off the event loop: filling a sheet triggers a multi-megapixel encode
+                    saved = {"path": await loop.run_in_executor(None, atlas.add, record.name, image)}
+                elif self.writer:
+                    encoded = await loop.run_in_executor(render_pool, render_encoded, record, None, sprite_bytes,
+                                                         self.fmt)
+                    filename = f"{record.name.lower()}{extension(self.fmt)}"
+                    saved = {"path": await loop.run_in_executor(None, self.writer.write, filename, encoded["data"]),
+                             "size": len(encoded["data"]), "encode_ms": encoded["encode_ms"]}
+                else:
+                    saved = await loop.run_in_executor(
+                        render_pool, render_to_file, record, None, sprite_bytes, self.output_dir, self.fmt)
+            except Exception as e:
+                report(target, name=record.name, error=f"render failed: {e}")
+            else:
+                if manifest is not None:
+                    manifest.update(saved["path"], inputs)
+                report(target, name=record.name, **saved)
+
+        await asyncio.gather(*(process(target, key) for target, key in keyed_targets))
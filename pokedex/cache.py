@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+CACHE_DIR = os.environ.get(
+    "PKMNCLI_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "pkmncli"),
+)
+
+# PokeAPI data is effectively static, so entries stay fresh for a week.
+DEFAULT_TTL = 7 * 24 * 60 * 60
+
+
+class ResponseCache:
+    """Disk-backed cache of JSON response bodies, keyed by URL."""
+
+    def __init__(self, directory=None, ttl=DEFAULT_TTL):
+        self.directory = directory or os.path.join(CACHE_DIR, "responses")
+        self.ttl = ttl
+
+    def _path(self, url):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, url):
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url, body, etag=None, ttl=None):
+        entry = {
+            "url": url,
+            "etag": etag,
+            "fetched_at": time.time(),
+            "ttl": self.ttl if ttl is None else ttl,
+            "body": body,
+        }
+        self._write(url, entry)
+        return entry
+
+    def touch(self, url, entry):
+        """Mark an entry as freshly validated (e.g. after a 304)."""
+        entry["fetched_at"] = time.time()
+        self._write(url, entry)
+        return entry
+
+    @staticmethod
+    def is_fresh(entry):
+        return time.time() - entry["fetched_at"] < entry["ttl"]
+
+    def _write(self, url, entry):
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+# Singleton instance
+response_cache = ResponseCache()
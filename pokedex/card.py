@@ -1,7 +1,10 @@
-from PIL import Image, ImageDraw, ImageFont, ImageOps
-import requests
-from io import BytesIO
+import functools
 import os
+from .api import pokeapi
+from .formats import DEFAULT_FORMAT, encode, extension, save_image
+from .models import as_record
+from .sprites import sprite_store
+from .trace import tracer
 
 TYPE_COLORS = {
     "electric": "#FFEA70",
@@ -23,11 +26,77 @@ TYPE_COLORS = {
     "default": "#2A1A1F"
 }
 
+# Card layout in pixels. Bump LAYOUT_VERSION whenever the static layer drawn
+# by CardGenerator.template changes, so cached templates are not reused.
+LAYOUT_VERSION = 1
+# Bump when anything else render() draws changes, so the output manifest
+# regenerates existing cards.
+RENDER_VERSION = 1
+CARD_SIZE = (400, 700)
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "output")
+BORDER_WIDTH = 6
+MARGIN = BORDER_WIDTH + 15
+NAME_Y = MARGIN
+TYPE_BOX_Y = NAME_Y + 40
+TYPE_BOX_HEIGHT = 35
+DIVIDER_1_Y = TYPE_BOX_Y + TYPE_BOX_HEIGHT + 20
+SPRITE_BOX_SIZE = 180
+# Increased sprite size from sprite_box_size - 20 to sprite_box_size - 10
+SPRITE_SIZE = SPRITE_BOX_SIZE - 10
+SPRITE_X = (CARD_SIZE[0] - SPRITE_BOX_SIZE) // 2
+SPRITE_Y = DIVIDER_1_Y + 20
+DIVIDER_2_Y = SPRITE_Y + SPRITE_BOX_SIZE + 20
+NUMBER_Y = DIVIDER_2_Y + 20
+STATS_HEADER_Y = NUMBER_Y + 30
+STATS_Y = STATS_HEADER_Y + 30
+STAT_ROW_HEIGHT = 22
+
+# Font sizes
+NAME_FONT = 28
+TYPE_FONT = 20
+STAT_FONT = 16
+NUMBER_FONT = 16
+
+STAT_LABELS = {
+    'hp': 'HP',
+    'attack': 'ATTACK',
+    'defense': 'DEFENSE',
+    'special-attack': 'SP.ATK',
+    'special-defense': 'SP.DEF',
+    'speed': 'SPEED'
+}
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(font_path, size):
+    """Load a TrueType font once per (path, size) in each process."""
+    from PIL import ImageFont
+
+    return ImageFont.truetype(font_path, size)
+
+
+@functools.lru_cache(maxsize=2048)
+def get_glyph_run(font_path, size, text):
+    """Rasterize `text` once into an "L" mask.
+
+    Returns (mask, (left, top), width) where (left, top) is the ink offset from
+    the text origin, so pasting the mask there matches `ImageDraw.text`.
+    """
+    from PIL import Image, ImageDraw
+
+    font = get_font(font_path, size)
+    left, top, right, bottom = font.getbbox(text)
+    mask = Image.new("L", (max(right - left, 1), max(bottom - top, 1)))
+    ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font)
+    return mask, (left, top), right - left
+
+
 class CardGenerator:
-    def __init__(self):
+    def __init__(self, output_dir=DEFAULT_OUTPUT_DIR):
         self.font_path = os.path.join(os.path.dirname(__file__), "assets", "BebasNeue-Regular.ttf")
-        self.output_dir = os.path.join(os.path.dirname(__file__), "..", "output")
-        os.makedirs(self.output_dir, exist_ok=True)
+        # Only generate() touches it; the directory is created on first save
+        self.output_dir = output_dir
+        self._templates = {}
 
     @staticmethod
     def darken_hex(hex_color, factor=0.6):
@@ -42,7 +111,7 @@ class CardGenerator:
         return lightened
 
     def draw_text(self, draw, text, xy, font_size=20, fill=(0, 0, 0), align="left", bold=False):
-        font = ImageFont.truetype(self.font_path, font_size)
+        font = get_font(self.font_path, font_size)
         bbox = font.getbbox(text)
         w = bbox[2] - bbox[0]
         x, y = xy
@@ -52,121 +121,166 @@ class CardGenerator:
             x -= w
         draw.text((x, y), text, fill=fill, font=font)
 
-    def generate(self, data, species):
-        width, height = 400, 700
-        types = [t["type"]["name"] for t in data["types"]]
-        primary_type = types[0] if types else "default"
-        bg_color = TYPE_COLORS.get(primary_type, TYPE_COLORS["default"])
-        dot_color = self.darken_hex(bg_color)
-        light_bg_color = self.lighten_hex(bg_color)
+    def paste_text(self, image, text, xy, font_size=20, fill=(0, 0, 0), align="left", bold=False):
+        """Same output as draw_text, but pastes a cached pre-rasterized glyph run."""
+        mask, (left, top), w = get_glyph_run(self.font_path, font_size, text)
+        x, y = xy
+        if align == "center":
+            x -= w // 2
+        elif align == "right":
+            x -= w
+        image.paste(fill, (x + left, y + top), mask)
 
-        card = Image.new("RGB", (width, height), "#F5F5F5")
-        draw = ImageDraw.Draw(card)
+    def warm(self):
+        """Preload fonts and static label glyphs (e.g. in each batch worker)."""
+        for size in (16, 18, 20, 28):
+            get_font(self.font_path, size)
+        static = [(16, label) for label in STAT_LABELS.values()] + [(20, "STATS"), (18, "NO IMAGE")]
+        for size, label in static:
+            get_glyph_run(self.font_path, size, label)
 
-        border_width = 6
-        draw.rectangle([(0, 0), (width - 1, height - 1)], outline="black", width=border_width)
+    def template(self, primary_type, stat_rows=6, sprite_box=True):
+        """The static layer of a card for one type, drawn once and cached.
 
-        name = data['name'].upper()
-        sprite_url = data['sprites']['front_default']
-        number = data['id']
-        type_ = primary_type.upper()
+        Holds the border, type box, dividers, the dotted sprite box (when
+        `sprite_box`) and `stat_rows` alternating stat bands. Keyed by
+        LAYOUT_VERSION too, so layout changes never reuse stale templates.
+        Treat the result as read-only; render() works on a copy.
+        """
+        type_key = primary_type if primary_type in TYPE_COLORS else "default"
+        key = (type_key, stat_rows, sprite_box, LAYOUT_VERSION)
+        template = self._templates.get(key)
+        if template is None:
+            template = self._templates[key] = self._draw_template(type_key, stat_rows, sprite_box)
+        return template
 
-        stats = {stat['stat']['name']: stat['base_stat'] for stat in data['stats']}
+    def precompute_templates(self, stat_rows=6):
+        """Draw the templates for every type up front (e.g. before a batch)."""
+        for type_key in TYPE_COLORS:
+            for sprite_box in (True, False):
+                self.template(type_key, stat_rows, sprite_box)
 
-        # Font sizes
-        name_font = 28
-        type_font = 20
-        stat_font = 16
-        number_font = 16
+    def _draw_template(self, type_key, stat_rows, sprite_box):
+        from PIL import Image, ImageDraw
 
-        margin = border_width + 15
-        current_y = margin
+        width, height = CARD_SIZE
+        bg_color = TYPE_COLORS[type_key]
+        dot_color = self.darken_hex(bg_color)
+        light_bg_color = self.lighten_hex(bg_color)
 
-        # Pokémon Name
-        self.draw_text(draw, name, (width // 2, current_y), font_size=name_font, fill="black", align="center", bold=True)
-        current_y += 40
+        card = Image.new("RGB", (width, height), "#F5F5F5")
+        draw = ImageDraw.Draw(card)
+        draw.rectangle([(0, 0), (width - 1, height - 1)], outline="black", width=BORDER_WIDTH)
 
         # Type Box - now using lighter shade of bg_color
-        type_box_height = 35
-        draw.rectangle([(margin, current_y), (width - margin, current_y + type_box_height)],
+        draw.rectangle([(MARGIN, TYPE_BOX_Y), (width - MARGIN, TYPE_BOX_Y + TYPE_BOX_HEIGHT)],
                        fill=light_bg_color, outline="black", width=2)
-        self.draw_text(draw, type_, (width // 2, current_y + 8), font_size=type_font,
-                       fill="black", align="center", bold=True)
-        current_y += type_box_height + 20
 
-        # Divider
-        draw.rectangle([(margin, current_y), (width - margin, current_y + 4)], fill="black")
-        current_y += 20
+        # Dividers
+        for divider_y in (DIVIDER_1_Y, DIVIDER_2_Y):
+            draw.rectangle([(MARGIN, divider_y), (width - MARGIN, divider_y + 4)], fill="black")
 
         # Sprite Box with dotted background
-        sprite_box_size = 180
-        sprite_x = (width - sprite_box_size) // 2
-        sprite_y = current_y
+        if sprite_box:
+            sprite_bg = Image.new("RGB", (SPRITE_BOX_SIZE, SPRITE_BOX_SIZE), bg_color)
+            sprite_bg_draw = ImageDraw.Draw(sprite_bg)
+            for y in range(0, SPRITE_BOX_SIZE, 10):
+                for x in range((y // 10) % 2 * 5, SPRITE_BOX_SIZE, 10):
+                    sprite_bg_draw.ellipse((x, y, x + 2, y + 2), fill=dot_color)
+            card.paste(sprite_bg, (SPRITE_X, SPRITE_Y))
+            draw.rectangle([(SPRITE_X, SPRITE_Y), (SPRITE_X + SPRITE_BOX_SIZE, SPRITE_Y + SPRITE_BOX_SIZE)],
+                           outline="black", width=3)
 
+        # Alternating stat row bands
+        for i in range(0, stat_rows, 2):
+            y_pos = STATS_Y + i * STAT_ROW_HEIGHT
+            draw.rectangle([(MARGIN, y_pos - 1), (width - MARGIN, y_pos + STAT_ROW_HEIGHT - 1)],
+                           fill=light_bg_color)
+        return card
+
+    def render(self, data, species=None, sprite_bytes=None):
+        """Draw the card and return it as a PIL image.
+
+        `data` is a PokemonRecord or the raw pokemon JSON (with `species`).
+        `sprite_bytes` lets callers that already downloaded the sprite skip
+        fetching it again.
+        """
+        record = as_record(data, species)
+        primary_type = record.types[0] if record.types else "default"
+        sprite_url = record.sprite_url
+        stats = dict(record.stats)
+
+        sprite_img = None
         if sprite_url:
             try:
-                sprite_img = Image.open(BytesIO(requests.get(sprite_url).content)).convert("RGBA")
-                sprite_bg = Image.new("RGB", (sprite_box_size, sprite_box_size), bg_color)
-                sprite_bg_draw = ImageDraw.Draw(sprite_bg)
-
-                for y in range(0, sprite_box_size, 10):
-                    for x in range((y // 10) % 2 * 5, sprite_box_size, 10):
-                        sprite_bg_draw.ellipse((x, y, x + 2, y + 2), fill=dot_color)
-
-                # Increased sprite size from sprite_box_size - 20 to sprite_box_size - 10
-                sprite_size = sprite_box_size - 10
-                sprite_img = sprite_img.resize((sprite_size, sprite_size), Image.Resampling.LANCZOS)
-                sprite_bg.paste(sprite_img,
-                                ((sprite_box_size - sprite_size) // 2, (sprite_box_size - sprite_size) // 2),
-                                sprite_img)
-
-                card.paste(sprite_bg, (sprite_x, sprite_y))
-                draw.rectangle([(sprite_x, sprite_y), (sprite_x + sprite_box_size, sprite_y + sprite_box_size)],
-                               outline="black", width=3)
-            except:
-                self.draw_text(draw, "NO IMAGE", (width // 2, sprite_y + sprite_box_size // 2),
-                               font_size=18, fill="black", align="center")
-
-        current_y += sprite_box_size + 20
-
-        # Divider
-        draw.rectangle([(margin, current_y), (width - margin, current_y + 4)], fill="black")
-        current_y += 20
-
-        # Pokémon Number
-        self.draw_text(draw, f"No. {number:03d}", (width // 2, current_y),
-                       font_size=number_font, fill="black", align="center", bold=True)
-        current_y += 30
-
-        # Stats Header
-        self.draw_text(draw, "STATS", (width // 2, current_y), font_size=type_font,
-                       fill="black", align="center", bold=True)
-        current_y += 30
-
-        # Stats with alternating background
-        row_height = 22
-        label_map = {
-            'hp': 'HP',
-            'attack': 'ATTACK',
-            'defense': 'DEFENSE',
-            'special-attack': 'SP.ATK',
-            'special-defense': 'SP.DEF',
-            'speed': 'SPEED'
-        }
-
-        for i, (key, value) in enumerate(stats.items()):
-            y_pos = current_y + i * row_height
-            if i % 2 == 0:
-                draw.rectangle([(margin, y_pos - 1), (width - margin, y_pos + row_height - 1)], fill=light_bg_color)
-            label = label_map.get(key, key.replace('-', ' ').upper())
-            self.draw_text(draw, label, (margin + 10, y_pos + 2), font_size=stat_font, fill="black")
-            self.draw_text(draw, str(value), (width - margin - 10, y_pos + 2),
-                           font_size=stat_font, fill="black", align="right", bold=True)
+                if sprite_bytes is None:
+                    sprite_bytes = pokeapi.fetch_sprite(sprite_url)
+                sprite_img = sprite_store.card_sprite(sprite_url, SPRITE_SIZE, raw=sprite_bytes)
+            except Exception:
+                pass
+
+        with tracer.span("render.draw", pokemon=record.name):
+            return self._draw(record, stats, primary_type, sprite_url, sprite_img)
+
+    def _draw(self, record, stats, primary_type, sprite_url, sprite_img):
+        """Composite the sprite and text onto a copy of the type template."""
+        width, height = CARD_SIZE
+        name = record.name.upper()
+        number = record.id
+        type_ = primary_type.upper()
+
+        # Phase spans (render.template/sprite/text) are no-ops unless tracing is enabled
+        with tracer.span("render.template", type=primary_type):
+            card = self.template(primary_type, len(stats), sprite_box=sprite_img is not None).copy()
+
+        # Sprite
+        with tracer.span("render.sprite"):
+            if sprite_img is not None:
+                offset = (SPRITE_BOX_SIZE - SPRITE_SIZE) // 2
+                card.paste(sprite_img, (SPRITE_X + offset, SPRITE_Y + offset), sprite_img)
+            elif sprite_url:
+                self.paste_text(card, "NO IMAGE", (width // 2, SPRITE_Y + SPRITE_BOX_SIZE // 2),
+                                font_size=18, fill="black", align="center")
+
+        with tracer.span("render.text"):
+            # Pokémon Name, Type and Number
+            self.paste_text(card, name, (width // 2, NAME_Y), font_size=NAME_FONT, fill="black", align="center",
+                            bold=True)
+            self.paste_text(card, type_, (width // 2, TYPE_BOX_Y + 8), font_size=TYPE_FONT,
+                            fill="black", align="center", bold=True)
+            self.paste_text(card, f"No. {number:03d}", (width // 2, NUMBER_Y),
+                            font_size=NUMBER_FONT, fill="black", align="center", bold=True)
+
+            # Stats
+            self.paste_text(card, "STATS", (width // 2, STATS_HEADER_Y), font_size=TYPE_FONT,
+                            fill="black", align="center", bold=True)
+            for i, (key, value) in enumerate(stats.items()):
+                y_pos = STATS_Y + i * STAT_ROW_HEIGHT
+                label = STAT_LABELS.get(key, key.replace('-', ' ').upper())
+                self.paste_text(card, label, (MARGIN + 10, y_pos + 2), font_size=STAT_FONT, fill="black")
+                self.paste_text(card, str(value), (width - MARGIN - 10, y_pos + 2),
+                                font_size=STAT_FONT, fill="black", align="right", bold=True)
+
+        return card
+
+    def render_bytes(self, data, species=None, sprite_bytes=None, fmt=DEFAULT_FORMAT):
+        """Draw the card and return it encoded in `fmt`, without touching the output directory."""
+        return encode(self.render(data, species, sprite_bytes=sprite_bytes), fmt)
+
+    def output_path(self, name, fmt=DEFAULT_FORMAT):
+        return os.path.join(self.output_dir, f"{name.lower()}{extension(fmt)}")
+
+    def generate(self, data, species=None, sprite_bytes=None, fmt=DEFAULT_FORMAT):
+        """Render and save the card in `fmt` (see pokedex.formats.FORMATS); returns the path."""
+        record = as_record(data, species)
+        card = self.render(record, sprite_bytes=sprite_bytes)
 
         # Save
-        output_path = os.path.join(self.output_dir, f"{data['name'].lower()}.png")
-        card.save(output_path)
-        print(f"Saved card: {output_path}")
+        output_path = self.output_path(record.name, fmt)
+        os.makedirs(self.output_dir, exist_ok=True)
+        with tracer.span("card.save", path=output_path, format=fmt):
+            save_image(card, output_path, fmt)
+        return output_path
 
 
 # Export singleton
@@ -0,0 +1,66 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from .api import pokeapi
+from .card import CARD_SIZE, card
+from .models import PokemonRecord
+
+
+def family_records(name, concurrency=16):
+    """Records and sprites of `name`'s evolution family, grouped by stage.
+
+    Returns (stages, failed): stages is [[(record, sprite_bytes), ...], ...]
+    from the base form on, failed is [(position, error message), ...] for
+    members that could not be fetched (they are left out of stages).
+    """
+    stages, failed = [], []
+    for stage_number, stage in enumerate(asyncio.run(pokeapi.fetch_family(name, concurrency=concurrency))):
+        members = []
+        for bundle in stage:
+            if isinstance(bundle, Exception):
+                failed.append((f"stage {stage_number + 1}", str(bundle)))
+            else:
+                members.append((PokemonRecord.from_api(bundle[0], bundle[1]), bundle[2]))
+        if members:
+            stages.append(members)
+    return stages, failed
+
+
+def render_family(stages, workers=None):
+    """Render every member's card in parallel; same shape as `stages`, with images."""
+    members = [member for stage in stages for member in stage]
+    with ThreadPoolExecutor(workers or len(members) or 1) as pool:
+        images = iter(list(pool.map(lambda member: card.render(member[0], sprite_bytes=member[1]), members)))
+    return [[next(images) for _ in stage] for stage in stages]
+
+
+def compose_strip(stages, gap=24, arrow_width=72, background="white", arrow_color=(120, 120, 120)):
+    """Lay out stages of card images left to right with arrows between them.
+
+    Branching stages (several forms at one step) are stacked in one column;
+    every column is centered vertically.
+    """
+    from PIL import Image, ImageDraw
+
+    width, height = CARD_SIZE
+    column_heights = [len(stage) * height + (len(stage) - 1) * gap for stage in stages]
+    strip_height = max(column_heights) + 2 * gap
+    strip_width = len(stages) * width + (len(stages) - 1) * (arrow_width + 2 * gap) + 2 * gap
+    strip = Image.new("RGB", (strip_width, strip_height), background)
+    draw = ImageDraw.Draw(strip)
+
+    x = gap
+    middle = strip_height // 2
+    for index, (stage, column_height) in enumerate(zip(stages, column_heights)):
+        y = (strip_height - column_height) // 2
+        for image in stage:
+            strip.paste(image, (x, y))
+            y += height + gap
+        x += width
+        if index < len(stages) - 1:
+            left, right = x + gap, x + gap + arrow_width
+            head = arrow_width // 2
+            draw.rectangle((left, middle - 6, right - head, middle + 6), fill=arrow_color)
+            draw.polygon([(right - head, middle - head // 1.5), (right, middle), (right - head, middle + head // 1.5)],
+                         fill=arrow_color)
+            x = right + gap
+    return strip
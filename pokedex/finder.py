@@ -1,21 +1,130 @@
-import difflib
-import requests
+import json
+import os
+import tempfile
+import threading
+import time
+from .api import API_ROOT, pokeapi
+from .cache import CACHE_DIR
+from .search import NameIndex
+from .store import dex_store
+from .trace import tracer
+from .transport import transport
+
+NAME_LIST_URL = API_ROOT + "pokemon?limit=10000"
+NAME_LIST_TTL = 24 * 60 * 60
+SNAPSHOT_PATH = os.path.join(CACHE_DIR, "names.json")
 
 class PokeFinder:
-    def __init__(self):
-        self.name_list = self.fetch_all_names()
+    """Name lookup backed by a local snapshot of the PokéAPI name list.
+
+    Nothing is loaded until the name list is first needed. A stale snapshot is
+    used immediately and refreshed in the background; the network is only
+    waited on when no snapshot exists yet.
+    """
+
+    def __init__(self, snapshot_path=SNAPSHOT_PATH):
+        self.snapshot_path = snapshot_path
+        self._name_list = None
+        self._index = None
+        # Reentrant: a stale snapshot starts its refresh while the index is loading
+        self._lock = threading.RLock()
+        self._refreshing = False
+
+    @property
+    def name_list(self):
+        return self.index.names
+
+    @property
+    def index(self):
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._load_index()
+        return self._index
+
+    def warm(self):
+        """Load the name list on a background thread."""
+        def load():
+            try:
+                self.name_list
+            except Exception:
+                pass  # raised again on the first real lookup
+
+        threading.Thread(target=load, daemon=True).start()
+
+    def _load_index(self):
+        with tracer.span("finder.load"):
+            snapshot = self.load_snapshot()
+            if snapshot is None:
+                index = NameIndex(self.fetch_all_names())
+                self.save_snapshot(index)
+                return index
+            if time.time() - snapshot["fetched_at"] > NAME_LIST_TTL:
+                self.refresh_in_background()
+            return NameIndex.from_dict(snapshot["names"], snapshot.get("index"))
+
+    def load_snapshot(self):
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_snapshot(self, index):
+        directory = os.path.dirname(self.snapshot_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"fetched_at": time.time(), "names": index.names, "index": index.to_dict()}, f)
+        os.replace(tmp_path, self.snapshot_path)
+
+    def refresh_in_background(self):
+        with self._lock:
+            if self._refreshing or pokeapi.offline:
+                return
+            self._refreshing = True
+
+        def refresh():
+            try:
+                index = NameIndex(self.fetch_all_names())
+                self.save_snapshot(index)
+                self._index = index
+            except Exception:
+                pass  # keep using the old snapshot
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=refresh, daemon=True).start()
 
     def fetch_all_names(self):
-        url = "https://pokeapi.co/api/v2/pokemon?limit=10000"
-        res = requests.get(url)
-        if res.status_code != 200:
-            raise Exception("Failed to fetch Pokémon list from API.")
-        results = res.json()["results"]
+        names = dex_store.names()
+        if names:
+            return names
+        if pokeapi.offline:
+            raise Exception("No local Pokémon list snapshot available in offline mode.")
+        with tracer.span("fetch.names"):
+            res = transport.get(NAME_LIST_URL)
+            if res.status_code != 200:
+                raise Exception("Failed to fetch Pokémon list from API.")
+            results = res.json()["results"]
         return [pokemon["name"] for pokemon in results]
 
-    def find_closest(self, input_name: str):
-        matches = difflib.get_close_matches(input_name.lower(), self.name_list, n=1, cutoff=0.6)
-        return matches[0] if matches else None
+    def find_closest(self, input_name: str, cutoff=0.6):
+        index = self.index
+        with tracer.span("finder.search", query=input_name):
+            return index.best(input_name, cutoff=cutoff)
+
+    def search(self, query: str, k=5, cutoff=0.6):
+        """Top-k (name, score) matches for `query`."""
+        return self.index.search(query, k=k, cutoff=cutoff)
+
+    def complete(self, prefix: str, k=10):
+        """Names starting with `prefix`, for autocomplete-as-you-type."""
+        return self.index.complete(prefix, k=k)
+
+    def resolve_many(self, names, cutoff=0.6):
+        """Resolve many inputs at once; returns {input: match or None}."""
+        return self.index.resolve_many(names, cutoff=cutoff)
 
-# Singleton instance
+# Singleton instance (cheap: the name list is loaded on first use)
 finder = PokeFinder()
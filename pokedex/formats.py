@@ -0,0 +1,134 @@
+import json
+import os
+import threading
+import time
+from io import BytesIO
+
+# name -> (file extension, Pillow format, save options)
+FORMATS = {
+    "png": (".png", "PNG", {}),
+    "png-optimized": (".png", "PNG", {"optimize": True}),
+    "png-palette": (".png", "PNG", {"optimize": True}),
+    "webp": (".webp", "WEBP", {"lossless": True, "method": 4}),
+}
+DEFAULT_FORMAT = "png"
+
+
+def _prepare(image, fmt):
+    if fmt != "png-palette":
+        return image
+    from PIL import Image
+
+    # Median cut keeps every color exactly when there are at most 256; beyond
+    # that only anti-aliased text and sprite edges shift slightly
+    return image.convert("RGB").quantize(256, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+
+
+def extension(fmt):
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}'. Formats: {', '.join(FORMATS)}.")
+    return FORMATS[fmt][0]
+
+
+def save_image(image, fp, fmt=DEFAULT_FORMAT):
+    """Encode `image` in `fmt` to a path or binary file object."""
+    extension(fmt)
+    _, pil_format, options = FORMATS[fmt]
+    _prepare(image, fmt).save(fp, pil_format, **options)
+
+
+def encode(image, fmt=DEFAULT_FORMAT):
+    buf = BytesIO()
+    save_image(image, buf, fmt)
+    return buf.getvalue()
+
+
+def compare_formats(images, formats=tuple(FORMATS)):
+    """Encode every image in each format; {format: {"bytes", "mean_bytes", "encode_ms", "mean_encode_ms"}}."""
+    if not images:
+        raise ValueError("No images to compare formats on.")
+    report = {}
+    for fmt in formats:
+        size = 0
+        start = time.perf_counter()
+        for image in images:
+            size += len(encode(image, fmt))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        report[fmt] = {
+            "bytes": size,
+            "mean_bytes": size / len(images),
+            "encode_ms": elapsed_ms,
+            "mean_encode_ms": elapsed_ms / len(images),
+        }
+    return report
+
+
+class AtlasWriter:
+    """Packs equally sized cards into grid sheets plus a JSON offset index.
+
+    Only the sheet being filled is held in memory; it is encoded and written
+    as soon as it is full. `close()` writes the last sheet and
+    `<name>.json`, which maps each card name to its sheet and pixel box.
+    `add()` may be called from several threads.
+    """
+
+    def __init__(self, output_dir, card_size, columns=8, rows=4, fmt=DEFAULT_FORMAT, name="atlas"):
+        self.output_dir = output_dir
+        self.card_size = card_size
+        self.columns = columns
+        self.rows = rows
+        self.fmt = fmt
+        self.name = name
+        self.sheets = []
+        self.cards = {}
+        self.bytes_written = 0
+        self.encode_ms = 0.0
+        self._sheet = None
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def _sheet_filename(self, index):
+        return f"{self.name}-{index:03d}{extension(self.fmt)}"
+
+    def add(self, card_name, image):
+        """Place one card; returns the path of the sheet it lands on."""
+        with self._lock:
+            return self._add(card_name, image)
+
+    def _add(self, card_name, image):
+        sheet_path = os.path.join(self.output_dir, self._sheet_filename(len(self.sheets)))
+        slot = self._count % (self.columns * self.rows)
+        if slot == 0:
+            from PIL import Image
+
+            self._sheet = Image.new("RGB", (self.columns * self.card_size[0], self.rows * self.card_size[1]), "white")
+        x = (slot % self.columns) * self.card_size[0]
+        y = (slot // self.columns) * self.card_size[1]
+        self._sheet.paste(image, (x, y))
+        self.cards[card_name] = {"sheet": len(self.sheets), "x": x, "y": y,
+                                 "w": self.card_size[0], "h": self.card_size[1]}
+        self._count += 1
+        if self._count % (self.columns * self.rows) == 0:
+            self._flush()
+        return sheet_path
+
+    def _flush(self):
+        if self._sheet is None:
+            return
+        filename = self._sheet_filename(len(self.sheets))
+        start = time.perf_counter()
+        save_image(self._sheet, os.path.join(self.output_dir, filename), self.fmt)
+        self.encode_ms += (time.perf_counter() - start) * 1000
+        self.bytes_written += os.path.getsize(os.path.join(self.output_dir, filename))
+        self.sheets.append(filename)
+        self._sheet = None
+
+    def close(self):
+        """Write the partially filled sheet and the index; returns the index path."""
+        with self._lock:
+            self._flush()
+        index_path = os.path.join(self.output_dir, f"{self.name}.json")
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump({"card_size": list(self.card_size), "format": self.fmt,
+                       "sheets": self.sheets, "cards": self.cards}, f)
+        return index_path
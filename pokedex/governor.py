@@ -0,0 +1,154 @@
+import collections
+import threading
+import time
+from urllib.parse import urlsplit
+from .transport import RETRY_STATUSES, _env_float
+
+
+class Governor:
+    """Token bucket plus an AIMD concurrency window shared by every request.
+
+    `acquire()` blocks until fewer than `limit` requests are in flight and
+    (when `rate` is set) a token is available; `release()` reports how the
+    request went. Healthy responses grow the window by about one request per
+    round trip; a throttling/5xx status, a connection error or a smoothed
+    latency above `latency_factor` times the best seen halves it, at most
+    once per round trip so a burst of failures counts as one signal.
+    Latency is tracked per endpoint (host, path minus its last segment and
+    status), so fast sprite fetches and 304s don't set the bar for large
+    JSON responses.
+    """
+
+    def __init__(self, rate=0.0, burst=None, initial_limit=4, min_limit=1, max_limit=16,
+                 latency_factor=3.0, decrease=0.5, window=5.0):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_factor = latency_factor
+        self.decrease = decrease
+        self.window = window
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+        self.queued = 0
+        self.throttled = 0
+        self._tokens = self.burst
+        self._refilled = time.monotonic()
+        self._latency = None
+        self._endpoints = {}
+        self._last_decrease = 0.0
+        self._completed = collections.deque()
+        self._cond = threading.Condition()
+
+    def configure(self, **options):
+        with self._cond:
+            for key, value in options.items():
+                if not hasattr(self, key) or key.startswith("_"):
+                    raise TypeError(f"Unknown governor option '{key}'.")
+                setattr(self, key, value)
+            if "rate" in options and "burst" not in options:
+                self.burst = max(1.0, self.rate)
+            self.limit = min(max(self.limit, self.min_limit), self.max_limit)
+            self._tokens = min(self._tokens, self.burst)
+            self._cond.notify_all()
+
+    def acquire(self):
+        """Wait for a slot in the window and a token; returns the start time to pass to release()."""
+        with self._cond:
+            self.queued += 1
+            try:
+                while True:
+                    if self.in_flight < int(self.limit):
+                        wait = self._take_token()
+                        if wait == 0:
+                            break
+                    else:
+                        wait = None
+                    self._cond.wait(wait)
+            finally:
+                self.queued -= 1
+            self.in_flight += 1
+        return time.monotonic()
+
+    def _take_token(self):
+        if not self.rate:
+            return 0
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+        return (1 - self._tokens) / self.rate
+
+    def release(self, started, status=None, url=None):
+        """Report a finished request: its HTTP status, or None for a connection error/timeout."""
+        now = time.monotonic()
+        latency = now - started
+        with self._cond:
+            self.in_flight -= 1
+            self._completed.append(now)
+            while self._completed and self._completed[0] < now - self.window:
+                self._completed.popleft()
+            if status is None or status in RETRY_STATUSES:
+                if status is not None:
+                    self.throttled += 1
+                self._back_off(now)
+            else:
+                if self._observe_latency(latency, _endpoint(url, status)):
+                    self._back_off(now)
+                else:
+                    self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def discard(self):
+        """Free a slot without a signal, for requests that failed on our side."""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def _observe_latency(self, latency, endpoint):
+        """Record a healthy response; True if its endpoint has become much slower than its best."""
+        self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+        smoothed, best = self._endpoints.get(endpoint, (latency, latency))
+        smoothed = 0.8 * smoothed + 0.2 * latency
+        # The floor drifts up slowly so one lucky response doesn't pin it forever
+        best = latency if latency < best else best * 1.001
+        self._endpoints[endpoint] = (smoothed, best)
+        return smoothed > self.latency_factor * best
+
+    def _back_off(self, now):
+        if now - self._last_decrease < (self._latency or 0.1):
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.decrease)
+
+    def stats(self):
+        """Current window, queue depth and observed request rate (per second over the last `window` s)."""
+        with self._cond:
+            now = time.monotonic()
+            recent = [t for t in self._completed if t >= now - self.window]
+            span = min(self.window, now - recent[0]) if len(recent) > 1 else self.window
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "rate": len(recent) / span,
+                "max_rate": self.rate or None,
+                "latency_ms": None if self._latency is None else self._latency * 1000,
+                "throttled": self.throttled,
+            }
+
+
+def _endpoint(url, status):
+    if url is None:
+        return None, None, status
+    parts = urlsplit(url)
+    return parts.netloc, parts.path.rstrip("/").rpartition("/")[0], status
+
+
+# Singleton instance
+governor = Governor(
+    rate=_env_float("PKMNCLI_MAX_RPS", 0.0),
+    max_limit=int(_env_float("PKMNCLI_MAX_CONCURRENCY", 16)),
+)
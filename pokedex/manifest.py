@@ -0,0 +1,53 @@
+import hashlib
+import json
+import os
+import uuid
+
+MANIFEST_NAME = ".manifest.json"
+
+
+def card_key(record, sprite_bytes, fmt):
+    """What a saved card depends on: its input fields, the sprite and the renderer version."""
+    from .card import LAYOUT_VERSION, RENDER_VERSION
+
+    fields = [record.name, record.id, list(record.types), [list(stat) for stat in record.stats], record.sprite_url]
+    return {
+        "input": hashlib.sha1(json.dumps(fields).encode("utf-8")).hexdigest(),
+        "sprite": hashlib.sha1(sprite_bytes).hexdigest() if sprite_bytes else None,
+        "renderer": f"{LAYOUT_VERSION}.{RENDER_VERSION}",
+        "format": fmt,
+    }
+
+
+class OutputManifest:
+    """Remembers what each file in an output directory was rendered from.
+
+    Entries are keyed by file name. A card whose key matches and whose file
+    still exists does not need to be rendered again. Only update it from one
+    thread (the batch runner's event loop).
+    """
+
+    def __init__(self, output_dir):
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def is_current(self, path, key):
+        return self.entries.get(os.path.basename(path)) == key and os.path.exists(path)
+
+    def update(self, path, key):
+        self.entries[os.path.basename(path)] = key
+
+    def save(self):
+        # Not mkstemp: its files are 0600, this one should get the umask's usual mode
+        tmp_path = f"{self.path}.{uuid.uuid4().hex}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, sort_keys=True)
+        os.replace(tmp_path, self.path)
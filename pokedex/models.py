@@ -0,0 +1,73 @@
+class PokemonRecord:
+    """The fields the card, CLI and server use, parsed once from PokeAPI JSON.
+
+    A full pokemon + species payload carries moves, game indices and flavor
+    text in every language; a record keeps a dozen fields in slots. `stats`
+    is a tuple of (name, base_stat) pairs in API order. Height is in metres
+    and weight in kilograms.
+    """
+
+    __slots__ = ("name", "id", "types", "stats", "height", "weight", "abilities",
+                 "base_experience", "growth_rate", "sprite_url", "evolution_chain_url")
+
+    def __init__(self, name, id, types=(), stats=(), height=0.0, weight=0.0, abilities=(),
+                 base_experience=None, growth_rate=None, sprite_url=None, evolution_chain_url=None):
+        self.name = name
+        self.id = id
+        self.types = tuple(types)
+        self.stats = tuple((stat, value) for stat, value in stats)
+        self.height = height
+        self.weight = weight
+        self.abilities = tuple(abilities)
+        self.base_experience = base_experience
+        self.growth_rate = growth_rate
+        self.sprite_url = sprite_url
+        self.evolution_chain_url = evolution_chain_url
+
+    @classmethod
+    def from_api(cls, data, species=None):
+        species = species or {}
+        return cls(
+            name=data["name"],
+            id=data["id"],
+            types=[t["type"]["name"] for t in data["types"]],
+            stats=[(stat["stat"]["name"], stat["base_stat"]) for stat in data["stats"]],
+            height=data.get("height", 0) / 10,
+            weight=data.get("weight", 0) / 10,
+            abilities=[a["ability"]["name"] for a in data.get("abilities", ())],
+            base_experience=data.get("base_experience"),
+            growth_rate=(species.get("growth_rate") or {}).get("name"),
+            sprite_url=(data.get("sprites") or {}).get("front_default"),
+            evolution_chain_url=(species.get("evolution_chain") or {}).get("url"),
+        )
+
+    @property
+    def total(self):
+        return sum(value for _, value in self.stats)
+
+    def to_dict(self):
+        """Plain JSON types; the inverse of from_dict."""
+        result = {slot: getattr(self, slot) for slot in self.__slots__}
+        result.update(types=list(self.types), abilities=list(self.abilities), stats=dict(self.stats))
+        return result
+
+    @classmethod
+    def from_dict(cls, payload):
+        payload = dict(payload)
+        payload["stats"] = payload.get("stats", {}).items()
+        return cls(**payload)
+
+    def __eq__(self, other):
+        if not isinstance(other, PokemonRecord):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self):
+        return f"PokemonRecord(name={self.name!r}, id={self.id!r})"
+
+
+def as_record(data, species=None):
+    """Accept either a PokemonRecord or raw (pokemon, species) JSON."""
+    if isinstance(data, PokemonRecord):
+        return data
+    return PokemonRecord.from_api(data, species)
@@ -0,0 +1,101 @@
+import asyncio
+import struct
+import zlib
+from .api import pokeapi
+from .card import CARD_SIZE, card
+from .models import PokemonRecord
+
+
+class PNGStreamWriter:
+    """Writes an 8-bit RGB PNG a band of rows at a time.
+
+    The header is written up front from the final size; each band is
+    filtered, fed through one zlib stream and emitted as IDAT chunks, so
+    only the current band is ever held in memory.
+    """
+
+    def __init__(self, fp, width, height, level=6):
+        self.fp = fp
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self._compressor = zlib.compressobj(level)
+        fp.write(b"\x89PNG\r\n\x1a\n")
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    def _chunk(self, kind, data):
+        self.fp.write(struct.pack(">I", len(data)) + kind + data)
+        self.fp.write(struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    def write_band(self, image):
+        """Append `image` (RGB, full width) below the rows written so far."""
+        if image.mode != "RGB" or image.width != self.width:
+            raise ValueError(f"Bands must be RGB and {self.width} px wide.")
+        if self.rows_written + image.height > self.height:
+            raise ValueError("Band runs past the bottom of the image.")
+        raw = image.tobytes()
+        stride = self.width * 3
+        # Filter type 0 (None) on every scanline
+        rows = b"".join(b"\x00" + raw[i:i + stride] for i in range(0, len(raw), stride))
+        data = self._compressor.compress(rows)
+        if data:
+            self._chunk(b"IDAT", data)
+        self.rows_written += image.height
+
+    def close(self):
+        if self.rows_written != self.height:
+            raise ValueError(f"Wrote {self.rows_written} of {self.height} rows.")
+        self._chunk(b"IDAT", self._compressor.flush())
+        self._chunk(b"IEND", b"")
+
+
+def _fetch_records(keys, concurrency):
+    bundles = asyncio.run(pokeapi.fetch_many_bundles(keys, concurrency=concurrency))
+    return [bundle if isinstance(bundle, Exception) else (PokemonRecord.from_api(bundle[0], bundle[1]), bundle[2])
+            for bundle in bundles]
+
+
+def render_montage(keys, fp, columns=10, card_width=None, gap=8, background="white",
+                   concurrency=8, on_row=None):
+    """Draw the cards for `keys` (names or ids) as a grid PNG written to `fp`.
+
+    Works one row band at a time: fetch that row's Pokémon, render and paste
+    its cards, encode the band and drop it, so peak memory follows one row
+    whatever the grid size. `card_width` scales cards down (aspect kept).
+    `on_row(row, rows, failures)` is called after each band. Returns
+    {"cards", "failed", "rows", "size": (width, height)}; cells whose fetch
+    or render failed are left blank.
+    """
+    from PIL import Image
+
+    width, height = CARD_SIZE
+    if card_width:
+        width, height = card_width, round(CARD_SIZE[1] * card_width / CARD_SIZE[0])
+    rows = max(1, -(-len(keys) // columns))
+    sheet_size = (columns * width + (columns + 1) * gap, rows * (height + gap) + gap)
+    writer = PNGStreamWriter(fp, *sheet_size)
+    failed = []
+
+    for row in range(rows):
+        row_keys = keys[row * columns:(row + 1) * columns]
+        # The top gap belongs to the first band, every band ends with a gap
+        band = Image.new("RGB", (sheet_size[0], height + gap + (gap if row == 0 else 0)), background)
+        top = gap if row == 0 else 0
+        row_failures = []
+        for column, (key, item) in enumerate(zip(row_keys, _fetch_records(row_keys, concurrency))):
+            try:
+                if isinstance(item, Exception):
+                    raise item
+                record, sprite_bytes = item
+                image = card.render(record, sprite_bytes=sprite_bytes)
+                if card_width:
+                    image = image.resize((width, height), Image.Resampling.LANCZOS)
+                band.paste(image, (gap + column * (width + gap), top))
+            except Exception as e:
+                row_failures.append((key, str(e)))
+        writer.write_band(band)
+        failed.extend(row_failures)
+        if on_row:
+            on_row(row + 1, rows, row_failures)
+    writer.close()
+    return {"cards": len(keys) - len(failed), "failed": failed, "rows": rows, "size": sheet_size}
@@ -0,0 +1,87 @@
+import asyncio
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from .api import pokeapi
+from .card import card
+from .formats import DEFAULT_FORMAT
+
+# Approximate number of Pokémon; random picks are drawn from 1..MAX_ID
+MAX_ID = 1010
+
+
+class Prefetcher:
+    """Speculative fetching and rendering for the interactive loop.
+
+    Work runs on a small background pool while the user reads or types.
+    Fetched bundles are kept by name until the foreground asks for them, so
+    a random pick resolved ahead of time is not fetched a second time. If a
+    speculative job fails, the foreground call raises the same error it
+    would have raised doing the work itself.
+    """
+
+    def __init__(self, workers=2, max_id=MAX_ID):
+        self.workers = workers
+        self.max_id = max_id
+        self._executor = None
+        self._bundles = {}
+        self._random = None
+        self._lock = threading.RLock()
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="pkmncli-prefetch")
+        return self._executor
+
+    def bundle(self, name):
+        """(data, species, sprite_bytes) for `name`, reusing a prefetched bundle when there is one."""
+        with self._lock:
+            future = self._bundles.pop(name.lower(), None)
+        if future is not None:
+            try:
+                return future.result()
+            except Exception:
+                pass  # retry in the foreground
+        return asyncio.run(pokeapi.fetch_pokemon_bundle(name))
+
+    def prepare_random(self):
+        """Start resolving the next random pick, unless one is already pending."""
+        with self._lock:
+            if self._random is None:
+                self._random = self.executor.submit(self._pick_random)
+
+    def _pick_random(self):
+        bundle = asyncio.run(pokeapi.fetch_pokemon_bundle(str(random.randint(1, self.max_id))))
+        done = Future()
+        done.set_result(bundle)
+        with self._lock:
+            self._bundles[bundle[0]["name"]] = done
+        return bundle[0]["name"]
+
+    def take_random(self):
+        """Name of a random Pokémon whose bundle is already fetched (waits for a pending pick)."""
+        with self._lock:
+            future, self._random = self._random, None
+        if future is None:
+            return self._pick_random()
+        return future.result()
+
+    def render_card(self, record, sprite_bytes=None, fmt=DEFAULT_FORMAT):
+        """Start drawing and encoding the card; the future's result is the encoded bytes."""
+        return self.executor.submit(card.render_bytes, record, sprite_bytes=sprite_bytes, fmt=fmt)
+
+    def close(self):
+        """Drop queued speculative work; a job already running is left to finish."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._bundles.clear()
+            self._random = None
+
+
+# Singleton instance
+prefetcher = Prefetcher()
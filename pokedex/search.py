@@ -0,0 +1,145 @@
+import bisect
+import difflib
+import heapq
+from collections import Counter
+
+# Bump when the persisted layout changes so old snapshots are rebuilt.
+INDEX_VERSION = 1
+
+
+def trigrams(word):
+    """Padded character trigrams, so short words and word edges still match."""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Trigram index over Pokémon names for fuzzy and prefix lookups.
+
+    Candidates are gathered from the trigram postings and the most promising
+    ones are scored with difflib's ratio. Any other name whose character
+    overlap (difflib's quick_ratio bound) could still reach the k-th score is
+    scored too, so results are exactly those of `difflib.get_close_matches`.
+    """
+
+    # How many trigram candidates get a full similarity score per result asked for
+    RERANK_FACTOR = 8
+
+    def __init__(self, names, postings=None):
+        self.names = list(names)
+        self._positions = {name: i for i, name in enumerate(self.names)}
+        self._sorted = sorted(self.names)
+        self._gram_counts = [len(trigrams(name)) for name in self.names]
+        self._char_postings = self._build_char_postings(self.names)
+        self.postings = postings if postings is not None else self._build_postings(self.names)
+
+    @staticmethod
+    def _build_postings(names):
+        postings = {}
+        for i, name in enumerate(names):
+            for gram in trigrams(name):
+                postings.setdefault(gram, []).append(i)
+        return postings
+
+    @staticmethod
+    def _build_char_postings(names):
+        # (char, n) -> names with at least n copies of char
+        postings = {}
+        for i, name in enumerate(names):
+            for char, count in Counter(name).items():
+                for n in range(1, count + 1):
+                    postings.setdefault((char, n), []).append(i)
+        return postings
+
+    def _overlaps(self, query):
+        """{name position: characters shared with `query`, counting repeats}."""
+        shared = Counter()
+        for char, count in Counter(query).items():
+            for n in range(1, count + 1):
+                shared.update(self._char_postings.get((char, n), ()))
+        return shared
+
+    def search(self, query, k=5, cutoff=0.6):
+        """Return up to `k` (name, score) pairs with score >= cutoff, best first."""
+        query = query.lower().strip()
+        if not query:
+            return []
+        if query in self._positions:
+            exact = [(query, 1.0)]
+            if k == 1:
+                return exact
+        else:
+            exact = []
+
+        query_grams = trigrams(query)
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self.postings.get(gram, ()))
+
+        # Rank candidates by Dice coefficient so long names don't win on raw overlap
+        n_query = len(query_grams)
+        counts = self._gram_counts
+        ranked = [(hits / (n_query + counts[i]), i) for i, hits in shared.items()]
+        candidates = [i for _, i in heapq.nlargest(max(k * self.RERANK_FACTOR, 16), ranked)]
+
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(query)
+        scored = []
+
+        def consider(i):
+            name = self.names[i]
+            if name == query:
+                return
+            matcher.set_seq1(name)
+            if matcher.real_quick_ratio() < cutoff or matcher.quick_ratio() < cutoff:
+                return
+            ratio = matcher.ratio()
+            if ratio >= cutoff:
+                scored.append((ratio, name))
+
+        for i in candidates:
+            consider(i)
+        # Trigrams miss some near misses (transposed letters break them): score
+        # every other name whose overlap bound could still make the top k
+        wanted = k - len(exact)
+        scored.sort(reverse=True)
+        floor = scored[wanted - 1][0] if 0 < wanted <= len(scored) else cutoff
+        seen = set(candidates)
+        for i, overlap in self._overlaps(query).items():
+            if i not in seen and 2.0 * overlap / (len(query) + len(self.names[i])) >= floor:
+                consider(i)
+        # Same ordering as difflib.get_close_matches, ties included
+        scored.sort(reverse=True)
+        return (exact + [(name, score) for score, name in scored])[:k]
+
+    def best(self, query, cutoff=0.6):
+        matches = self.search(query, k=1, cutoff=cutoff)
+        return matches[0][0] if matches else None
+
+    def complete(self, prefix, k=10):
+        """Names starting with `prefix`, alphabetically (autocomplete)."""
+        prefix = prefix.lower().strip()
+        start = bisect.bisect_left(self._sorted, prefix)
+        results = []
+        for name in self._sorted[start:]:
+            if not name.startswith(prefix) or len(results) == k:
+                break
+            results.append(name)
+        return results
+
+    def resolve_many(self, queries, cutoff=0.6):
+        """Map each query to its best match (or None), scoring duplicates once."""
+        resolved = {}
+        for query in queries:
+            if query not in resolved:
+                resolved[query] = self.best(query, cutoff=cutoff)
+        return resolved
+
+    def to_dict(self):
+        return {"version": INDEX_VERSION, "postings": self.postings}
+
+    @classmethod
+    def from_dict(cls, names, payload):
+        if not payload or payload.get("version") != INDEX_VERSION:
+            return cls(names)
+        return cls(names, postings=payload["postings"])
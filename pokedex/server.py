@@ -0,0 +1,154 @@
+"""Small HTTP service that renders cards on demand.
+
+    GET /card/<name>.png      the card as PNG
+    GET /pokemon/<name>.json  stats summary as JSON
+    GET /healthz              liveness check
+
+Names are resolved through the finder. Results are kept in an in-memory LRU
+and concurrent requests for the same Pokémon share one fetch and render.
+
+    python -m pokedex.server --port 8000 --workers 4
+"""
+import argparse
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+from .api import pokeapi, pokemon_summary
+from .finder import finder
+
+
+class RenderService:
+    """Fetch/render results with an LRU cache and request coalescing.
+
+    At most `workers` fetch+render jobs run at once; everything else waits in
+    the pool's queue.
+    """
+
+    def __init__(self, workers=4, cache_size=256):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="render")
+        self.cache_size = cache_size
+        self._results = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key, produce):
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._inflight[key] = Future()
+                owner = True
+            else:
+                owner = False
+        if owner:
+            self.pool.submit(self._produce, key, produce, future)
+        return future.result()
+
+    def _produce(self, key, produce, future):
+        try:
+            result = produce()
+        except Exception as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            return
+        with self._lock:
+            del self._inflight[key]
+            self._results[key] = result
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+        future.set_result(result)
+
+    @staticmethod
+    def resolve(name):
+        actual_name = finder.find_closest(name)
+        if not actual_name:
+            raise LookupError(f"No Pokémon matches '{name}'.")
+        return actual_name
+
+    def card_png(self, name):
+        actual_name = self.resolve(name)
+        return self._get(("card", actual_name), lambda: self._render_card(actual_name))
+
+    def pokemon_json(self, name):
+        actual_name = self.resolve(name)
+        return self._get(("json", actual_name), lambda: self._summarize(actual_name))
+
+    @staticmethod
+    def _render_card(name):
+        from .card import card
+
+        return card.render_bytes(pokeapi.fetch_record(name))
+
+    @staticmethod
+    def _summarize(name):
+        return json.dumps(pokemon_summary(pokeapi.fetch_record(name))).encode("utf-8")
+
+
+class CardRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this, keep-alive clients hit delayed-ACK stalls
+    disable_nagle_algorithm = True
+    service = None  # set by make_server
+
+    def do_GET(self):
+        path = unquote(self.path.split("?", 1)[0])
+        try:
+            if path == "/healthz":
+                self._send(200, "text/plain", b"ok")
+            elif path.startswith("/card/") and path.endswith(".png"):
+                self._send(200, "image/png", self.service.card_png(path[len("/card/"):-len(".png")]))
+            elif path.startswith("/pokemon/") and path.endswith(".json"):
+                self._send(200, "application/json", self.service.pokemon_json(path[len("/pokemon/"):-len(".json")]))
+            else:
+                self._send_error(404, "Not found.")
+        except (LookupError, ValueError) as e:
+            self._send_error(404, str(e))
+        except Exception as e:
+            self._send_error(502, str(e))
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send(status, "application/json", json.dumps({"error": message}).encode("utf-8"))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host="127.0.0.1", port=8000, workers=4, cache_size=256):
+    handler = type("BoundCardRequestHandler", (CardRequestHandler,),
+                   {"service": RenderService(workers=workers, cache_size=cache_size)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Pokémon cards over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=4, help="concurrent fetch+render jobs")
+    parser.add_argument("--cache-size", type=int, default=256, help="results kept in memory")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.workers, args.cache_size)
+    print(f"Serving cards on http://{args.host}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from .cache import CACHE_DIR
+from .trace import tracer
+from .transport import transport
+
+DEFAULT_MAX_BYTES = int(float(os.environ.get("PKMNCLI_SPRITE_CACHE_MB", 32)) * 1024 * 1024)
+
+
+class SpriteStore:
+    """Sprites and their decoded variants, fetched and decoded once.
+
+    Raw PNG bytes live in a byte-budgeted in-memory LRU backed by an on-disk
+    tier. Decoded variants (the RGBA sprite at card size, the grayscale or
+    RGBA sprite at an ASCII width) are kept in the same LRU. Returned images are shared:
+    callers must not modify them in place.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or os.path.join(CACHE_DIR, "sprites")
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def _remember(self, key, value, size):
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+        return value
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".png")
+
+    def raw(self, url, fetch=True):
+        """PNG bytes for `url` from memory, disk, or (if `fetch`) the network."""
+        key = (url, "raw")
+        data = self._lookup(key)
+        if data is not None:
+            tracer.count("sprite.hit.memory")
+            return data
+        try:
+            with open(self._path(url), "rb") as f:
+                data = f.read()
+            tracer.count("sprite.hit.disk")
+        except OSError:
+            if not fetch:
+                return None
+            tracer.count("sprite.miss")
+            data = transport.get_bytes(url)
+            self._save(url, data)
+        return self._remember(key, data, len(data))
+
+    def put_raw(self, url, data):
+        """Register bytes downloaded elsewhere so they are not fetched again."""
+        if self._lookup((url, "raw")) is None:
+            self._save(url, data)
+            self._remember((url, "raw"), data, len(data))
+
+    def _save(self, url, data):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(url))
+        except OSError:
+            pass  # the disk tier is best-effort
+
+    def _variant(self, url, variant, raw, build):
+        key = (url,) + variant
+        image = self._lookup(key)
+        if image is not None:
+            return image
+        if raw is None:
+            raw = self.raw(url, fetch=False)
+        if raw is None:
+            raise ValueError(f"Sprite '{url}' is not available.")
+        from PIL import Image
+
+        with tracer.span("sprite.decode", variant=variant[0]):
+            image = build(Image, Image.open(BytesIO(raw)))
+            image.load()
+        return self._remember(key, image, image.width * image.height * len(image.getbands()))
+
+    def card_sprite(self, url, size, raw=None):
+        """The sprite as RGBA, LANCZOS-resized to `size` x `size`."""
+        return self._variant(url, ("card", size), raw,
+                             lambda Image, img: img.convert("RGBA").resize((size, size), Image.Resampling.LANCZOS))
+
+    def ascii_sprite(self, url, width, raw=None):
+        """The sprite as grayscale, resized to `width` columns for ASCII art."""
+        def build(Image, img):
+            img = img.convert("L")
+            # Terminal cells are about twice as tall as they are wide
+            height = int(img.height / img.width * width * 0.55)
+            return img.resize((width, height))
+
+        return self._variant(url, ("ascii", width), raw, build)
+
+    def ansi_sprite(self, url, width, raw=None):
+        """The sprite as RGBA, `width` columns by an even number of rows for half-block art."""
+        def build(Image, img):
+            img = img.convert("RGBA")
+            # Two pixel rows per terminal cell, so pixels stay roughly square
+            height = max(2, round(img.height / img.width * width))
+            return img.resize((width, height + height % 2))
+
+        return self._variant(url, ("ansi", width), raw, build)
+
+
+# Singleton instance
+sprite_store = SpriteStore()
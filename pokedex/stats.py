@@ -0,0 +1,159 @@
+import json
+import operator
+import os
+import re
+import tempfile
+import numpy as np
+from .cache import CACHE_DIR
+from .store import dex_store
+
+STATS_DIR = os.path.join(CACHE_DIR, "stats")
+TABLE_VERSION = 1
+
+STAT_COLUMNS = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+COLUMNS = ["id"] + STAT_COLUMNS + ["total", "height", "weight", "base_experience"]
+
+OPERATORS = {
+    ">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+    "=": operator.eq, "==": operator.eq, "!=": operator.ne,
+}
+CONDITION_RE = re.compile(r"^\s*([a-z_-]+)\s*(>=|<=|==|!=|>|<|=)\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+def column_name(text):
+    """Accept "special_attack" / "base-experience" spellings; raises ValueError for unknown columns."""
+    column = text.lower().replace("_", "-").replace("base-experience", "base_experience")
+    if column not in COLUMNS:
+        raise ValueError(f"Unknown column '{text}'. Columns: {', '.join(COLUMNS)}.")
+    return column
+
+
+def parse_condition(text):
+    """"total>600" -> ("total", ">", 600.0); raises ValueError on anything else."""
+    match = CONDITION_RE.match(text.lower())
+    if not match:
+        raise ValueError(f"Can't parse condition '{text}' (expected e.g. speed>=100).")
+    return column_name(match.group(1)), match.group(2), float(match.group(3))
+
+
+class StatsTable:
+    """Columnar stats for every synced Pokémon, one NumPy array per column.
+
+    Built once from the dex store and saved as .npy files that are
+    memory-mapped on load, so queries never parse per-Pokémon JSON. Missing
+    base_experience is stored as -1; type2 is -1 for single-type Pokémon.
+    """
+
+    def __init__(self, columns, names, type_names, source):
+        self.columns = columns
+        self.names = names
+        self.type_names = type_names
+        self.source = source
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def build(cls, store=dex_store):
+        rows = store.bodies()
+        if not rows:
+            raise ValueError("The local dex is empty. Run `cli.py sync` first.")
+        n = len(rows)
+        stats = np.zeros((n, len(STAT_COLUMNS)), dtype=np.int16)
+        ids = np.zeros(n, dtype=np.int32)
+        height = np.zeros(n, dtype=np.float32)
+        weight = np.zeros(n, dtype=np.float32)
+        base_experience = np.full(n, -1, dtype=np.int16)
+        types = np.full((n, 2), -1, dtype=np.int8)
+        names = []
+        type_codes = {}
+        for i, body in enumerate(rows):
+            data = json.loads(body)
+            names.append(data["name"])
+            ids[i] = data["id"]
+            for stat in data["stats"]:
+                if stat["stat"]["name"] in STAT_COLUMNS:
+                    stats[i, STAT_COLUMNS.index(stat["stat"]["name"])] = stat["base_stat"]
+            height[i] = data["height"] / 10
+            weight[i] = data["weight"] / 10
+            if data.get("base_experience") is not None:
+                base_experience[i] = data["base_experience"]
+            for slot, entry in enumerate(data["types"][:2]):
+                types[i, slot] = type_codes.setdefault(entry["type"]["name"], len(type_codes))
+
+        columns = {"id": ids, "total": stats.sum(axis=1, dtype=np.int16), "height": height,
+                   "weight": weight, "base_experience": base_experience, "type1": types[:, 0], "type2": types[:, 1]}
+        for j, name in enumerate(STAT_COLUMNS):
+            columns[name] = np.ascontiguousarray(stats[:, j])
+        return cls(columns, names, sorted(type_codes, key=type_codes.get), list(store.version()))
+
+    def save(self, directory=STATS_DIR):
+        """Write one .npy per column plus meta.json; the directory is swapped in atomically."""
+        parent = os.path.dirname(directory)
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=parent, suffix=".tmp")
+        for name, array in self.columns.items():
+            np.save(os.path.join(tmp_dir, name + ".npy"), array)
+        meta = {"version": TABLE_VERSION, "source": self.source, "names": self.names, "types": self.type_names}
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        if os.path.isdir(directory):
+            old_dir = directory + ".old"
+            os.replace(directory, old_dir)
+            os.replace(tmp_dir, directory)
+            for filename in os.listdir(old_dir):
+                os.remove(os.path.join(old_dir, filename))
+            os.rmdir(old_dir)
+        else:
+            os.replace(tmp_dir, directory)
+
+    @classmethod
+    def load(cls, directory=STATS_DIR):
+        """Memory-map a saved table, or None if there is none (or it is from another version)."""
+        try:
+            with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != TABLE_VERSION:
+                return None
+            columns = {filename[:-4]: np.load(os.path.join(directory, filename), mmap_mode="r")
+                       for filename in os.listdir(directory) if filename.endswith(".npy")}
+        except (OSError, ValueError):
+            return None
+        return cls(columns, meta["names"], meta["types"], meta["source"])
+
+    @classmethod
+    def open(cls, store=dex_store, directory=STATS_DIR, rebuild=False):
+        """Load the saved table, rebuilding it first if the dex store has changed since."""
+        if not store.available:
+            raise ValueError("There is no local dex yet. Run `cli.py sync` first.")
+        table = None if rebuild else cls.load(directory)
+        if table is None or table.source != list(store.version()):
+            table = cls.build(store)
+            table.save(directory)
+        return table
+
+    def query(self, conditions=(), types=(), sort="total", descending=True, limit=None):
+        """Row indices matching every (column, op, value) condition and any of `types`, sorted and cut to `limit`."""
+        mask = np.ones(len(self), dtype=bool)
+        for column, op, value in conditions:
+            mask &= OPERATORS[op](self.columns[column], value)
+        if types:
+            codes = [self.type_names.index(t) for t in types if t in self.type_names]
+            mask &= np.isin(self.columns["type1"], codes) | np.isin(self.columns["type2"], codes)
+        rows = np.flatnonzero(mask)
+        keys = self.columns[sort][rows]
+        order = np.argsort(-keys if descending else keys, kind="stable")
+        rows = rows[order]
+        return rows if limit is None else rows[:limit]
+
+    def row(self, index):
+        """One row as plain JSON types."""
+        result = {"name": self.names[index]}
+        for name in COLUMNS:
+            value = self.columns[name][index].item()
+            result[name] = round(value, 1) if isinstance(value, float) else value
+        if result["base_experience"] < 0:
+            result["base_experience"] = None
+        result["types"] = [self.type_names[self.columns[slot][index]] for slot in ("type1", "type2")
+                           if self.columns[slot][index] >= 0]
+        return result
@@ -0,0 +1,240 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .cache import CACHE_DIR, DEFAULT_TTL
+from .transport import transport
+
+DEX_PATH = os.path.join(CACHE_DIR, "dex.sqlite3")
+
+# Results are committed in chunks, so an interrupted sync loses at most this many
+COMMIT_EVERY = 50
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pokemon (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    etag TEXT,
+    body TEXT,
+    species_url TEXT,
+    sprite_url TEXT,
+    synced_at REAL
+);
+CREATE TABLE IF NOT EXISTS species (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    body TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chains (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    body TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sprites (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    data BLOB NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+class DexStore:
+    """The whole dex (pokemon, species, evolution chains, sprites) in one SQLite file.
+
+    Filled by `sync()`; lookups are then indexed local reads. Rows are written
+    as they arrive, so an interrupted sync resumes where it stopped, and later
+    syncs only download new entries and re-check old ones with conditional
+    requests. Each thread gets its own connection.
+    """
+
+    def __init__(self, path=DEX_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._available = None
+
+    @property
+    def available(self):
+        """Whether a store file exists; checked once per process."""
+        if self._available is None:
+            self._available = os.path.exists(self.path)
+        return self._available
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            self._available = True
+        return conn
+
+    def pokemon(self, key):
+        """Pokemon JSON by name or id, or None if it has not been synced."""
+        if not self.available:
+            return None
+        column = "id" if str(key).isdigit() else "name"
+        row = self._connection().execute(
+            f"SELECT body FROM pokemon WHERE {column} = ? AND body IS NOT NULL", (str(key).lower(),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def species(self, url):
+        if not self.available:
+            return None
+        row = self._connection().execute("SELECT body FROM species WHERE url = ?", (url,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def chain(self, url):
+        if not self.available:
+            return None
+        row = self._connection().execute("SELECT body FROM chains WHERE url = ?", (url,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def sprite(self, url):
+        if not self.available:
+            return None
+        row = self._connection().execute("SELECT data FROM sprites WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def names(self):
+        """Every known Pokémon name, in id order."""
+        if not self.available:
+            return []
+        return [row[0] for row in self._connection().execute("SELECT name FROM pokemon ORDER BY id")]
+
+    def bodies(self):
+        """Raw JSON text of every synced pokemon, in id order."""
+        return [row[0] for row in self._connection().execute(
+            "SELECT body FROM pokemon WHERE body IS NOT NULL ORDER BY id")]
+
+    def version(self):
+        """(count, last sync time) of the pokemon table; changes whenever a sync adds or updates one."""
+        return self._connection().execute(
+            "SELECT COUNT(*), MAX(synced_at) FROM pokemon WHERE body IS NOT NULL").fetchone()
+
+    def counts(self):
+        conn = self._connection()
+        return {
+            "pokemon": conn.execute("SELECT COUNT(*) FROM pokemon WHERE body IS NOT NULL").fetchone()[0],
+            "species": conn.execute("SELECT COUNT(*) FROM species").fetchone()[0],
+            "chains": conn.execute("SELECT COUNT(*) FROM chains").fetchone()[0],
+            "sprites": conn.execute("SELECT COUNT(*) FROM sprites").fetchone()[0],
+        }
+
+    def sync(self, name_list_url, concurrency=16, revalidate=False, max_age=DEFAULT_TTL, progress=None):
+        """Download everything listed at `name_list_url` into the store.
+
+        Missing entries are fetched; entries older than `max_age` seconds (or
+        all of them with `revalidate`) are re-checked with If-None-Match, so
+        unchanged ones cost a 304. `progress(stage, done, total)` is called as
+        results arrive. Returns per-stage fetched/unchanged/failed counts.
+        """
+        start = time.perf_counter()
+        conn = self._connection()
+        res = transport.get(name_list_url)
+        if res.status_code != 200:
+            raise Exception("Failed to fetch Pokémon list from API.")
+        listed = [(int(entry["url"].rstrip("/").rsplit("/", 1)[-1]), entry["name"], entry["url"])
+                  for entry in res.json()["results"]]
+        conn.executemany(
+            "INSERT INTO pokemon (id, name, url) VALUES (?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET name = excluded.name, url = excluded.url", listed)
+        conn.commit()
+
+        stale_before = time.time() - (0 if revalidate else max_age)
+        summary = {}
+
+        jobs = conn.execute(
+            "SELECT id, url, etag FROM pokemon WHERE body IS NULL OR synced_at < ?", (stale_before,)).fetchall()
+        summary["pokemon"] = self._transfer("pokemon", jobs, concurrency, progress, self._save_pokemon,
+                                            "UPDATE pokemon SET synced_at = ? WHERE id = ?")
+
+        jobs = conn.execute(
+            "SELECT DISTINCT p.species_url, p.species_url, s.etag FROM pokemon p "
+            "LEFT JOIN species s ON s.url = p.species_url "
+            "WHERE p.species_url IS NOT NULL AND (s.url IS NULL OR s.synced_at < ?)", (stale_before,)).fetchall()
+        summary["species"] = self._transfer("species", jobs, concurrency, progress, self._save_species,
+                                            "UPDATE species SET synced_at = ? WHERE url = ?")
+
+        jobs = conn.execute(
+            "SELECT DISTINCT l.url, l.url, c.etag FROM "
+            "(SELECT json_extract(body, '$.evolution_chain.url') AS url FROM species) l "
+            "LEFT JOIN chains c ON c.url = l.url "
+            "WHERE l.url IS NOT NULL AND (c.url IS NULL OR c.synced_at < ?)", (stale_before,)).fetchall()
+        summary["chains"] = self._transfer("chains", jobs, concurrency, progress, self._save_chain,
+                                           "UPDATE chains SET synced_at = ? WHERE url = ?")
+
+        # Sprite files never change in place, so only missing ones are fetched
+        jobs = conn.execute(
+            "SELECT DISTINCT p.sprite_url, p.sprite_url, NULL FROM pokemon p "
+            "LEFT JOIN sprites s ON s.url = p.sprite_url "
+            "WHERE p.sprite_url IS NOT NULL AND s.url IS NULL").fetchall()
+        summary["sprites"] = self._transfer("sprites", jobs, concurrency, progress, self._save_sprite, None)
+
+        summary["elapsed"] = time.perf_counter() - start
+        return summary
+
+    def _transfer(self, stage, jobs, concurrency, progress, save, touch_sql):
+        counts = {"fetched": 0, "unchanged": 0, "failed": 0}
+        conn = self._connection()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = {pool.submit(self._conditional_get, url, etag): key for key, url, etag in jobs}
+            for done, future in enumerate(as_completed(futures), 1):
+                key = futures[future]
+                try:
+                    status, content, etag = future.result()
+                except Exception:
+                    status = None
+                if status == 200:
+                    save(conn, key, content, etag)
+                    counts["fetched"] += 1
+                elif status == 304 and touch_sql:
+                    conn.execute(touch_sql, (time.time(), key))
+                    counts["unchanged"] += 1
+                else:
+                    counts["failed"] += 1
+                if done % COMMIT_EVERY == 0:
+                    conn.commit()
+                if progress:
+                    progress(stage, done, len(jobs))
+        conn.commit()
+        return counts
+
+    @staticmethod
+    def _conditional_get(url, etag):
+        res = transport.get(url, headers={"If-None-Match": etag} if etag else None)
+        return res.status_code, res.content, res.headers.get("ETag")
+
+    @staticmethod
+    def _save_pokemon(conn, key, content, etag):
+        data = json.loads(content)
+        conn.execute(
+            "UPDATE pokemon SET etag = ?, body = ?, species_url = ?, sprite_url = ?, synced_at = ? WHERE id = ?",
+            (etag, content.decode("utf-8"), data["species"]["url"], data["sprites"]["front_default"],
+             time.time(), key))
+
+    @staticmethod
+    def _save_species(conn, key, content, etag):
+        conn.execute("INSERT OR REPLACE INTO species (url, etag, body, synced_at) VALUES (?, ?, ?, ?)",
+                     (key, etag, content.decode("utf-8"), time.time()))
+
+    @staticmethod
+    def _save_chain(conn, key, content, etag):
+        conn.execute("INSERT OR REPLACE INTO chains (url, etag, body, synced_at) VALUES (?, ?, ?, ?)",
+                     (key, etag, content.decode("utf-8"), time.time()))
+
+    @staticmethod
+    def _save_sprite(conn, key, content, etag):
+        conn.execute("INSERT OR REPLACE INTO sprites (url, etag, data, synced_at) VALUES (?, ?, ?, ?)",
+                     (key, etag, content, time.time()))
+
+
+# Singleton instance (nothing is opened until the first lookup)
+dex_store = DexStore()
@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+
+class _NullSpan:
+    """Shared no-op span handed out while tracing is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer._record(self.name, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+
+class Tracer:
+    """Timing spans and counters for the lookup and render path.
+
+    Disabled by default: `span()` then returns a shared no-op context manager
+    and `count()` returns immediately, so instrumentation costs an attribute
+    check per call site.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._epoch = time.perf_counter_ns()
+        self._events = []
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._events = []
+            self.counters = Counter()
+            self._epoch = time.perf_counter_ns()
+
+    def span(self, name, /, **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def count(self, name, value=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] += value
+
+    def _record(self, name, start, end, args):
+        with self._lock:
+            self._events.append((name, start, end, threading.get_ident(), args))
+
+    def breakdown(self):
+        """Per-stage {"calls", "total_ms", "mean_ms", "max_ms"}, slowest total first."""
+        stages = {}
+        with self._lock:
+            events = list(self._events)
+        for name, start, end, _, _ in events:
+            ms = (end - start) / 1e6
+            stage = stages.setdefault(name, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stage["calls"] += 1
+            stage["total_ms"] += ms
+            stage["max_ms"] = max(stage["max_ms"], ms)
+        for stage in stages.values():
+            stage["mean_ms"] = stage["total_ms"] / stage["calls"]
+        return dict(sorted(stages.items(), key=lambda item: -item[1]["total_ms"]))
+
+    def write_chrome_trace(self, path):
+        """Write spans and final counter values in Chrome trace-event format (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events)
+            counters = dict(self.counters)
+        trace_events = [
+            {
+                "name": name,
+                "cat": name.split(".", 1)[0],
+                "ph": "X",
+                "ts": (start - self._epoch) / 1000,
+                "dur": (end - start) / 1000,
+                "pid": pid,
+                "tid": tid,
+                "args": args,
+            }
+            for name, start, end, tid, args in events
+        ]
+        end_ts = max((event["ts"] + event["dur"] for event in trace_events), default=0)
+        trace_events.extend(
+            {"name": name, "ph": "C", "ts": end_ts, "pid": pid, "args": {"value": value}}
+            for name, value in sorted(counters.items())
+        )
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+
+
+# Singleton instance
+tracer = Tracer()
@@ -0,0 +1,138 @@
+import os
+import random
+import threading
+import time
+from .trace import tracer
+
+# Statuses worth retrying: throttling and transient upstream failures.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class Transport:
+    """Shared HTTP transport: one pooled keep-alive session for every request.
+
+    Each host gets at most `pool_maxsize` open connections (requests block for
+    a free one rather than opening more), every request has a connect/read
+    timeout, and failed requests are retried a bounded number of times with
+    full-jitter exponential backoff. Every attempt also passes through the
+    shared `governor`, which paces and adapts concurrency across threads.
+    """
+
+    def __init__(self, connect_timeout=3.05, read_timeout=15, retries=3,
+                 backoff=0.5, max_backoff=8.0, pool_connections=4, pool_maxsize=16,
+                 governor=None):
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._governor = governor
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def governor(self):
+        # Looked up on first use: the governor module builds on this one's settings
+        if self._governor is None:
+            from .governor import governor
+
+            self._governor = governor
+        return self._governor
+
+    @governor.setter
+    def governor(self, value):
+        self._governor = value
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._build_session()
+        return self._session
+
+    def _build_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                              pool_maxsize=self.pool_maxsize, pool_block=True)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["User-Agent"] = "pkmncli"
+        return session
+
+    def configure(self, **options):
+        """Update timeouts/retry/pool settings; the session is rebuilt lazily."""
+        connect_timeout = options.pop("connect_timeout", self.timeout[0])
+        read_timeout = options.pop("read_timeout", self.timeout[1])
+        self.timeout = (connect_timeout, read_timeout)
+        for key, value in options.items():
+            if not hasattr(self, key):
+                raise TypeError(f"Unknown transport option '{key}'.")
+            setattr(self, key, value)
+        self.close()
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def get(self, url, headers=None, timeout=None):
+        """GET `url`, retrying connection errors and retryable statuses.
+
+        The last response (or exception) is returned (or raised) once the
+        retry budget is spent.
+        """
+        import requests
+
+        for attempt in range(self.retries + 1):
+            retry_after = None
+            started = self.governor.acquire()
+            try:
+                res = self.session.get(url, headers=headers, timeout=timeout or self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                self.governor.release(started)
+                if attempt == self.retries:
+                    raise
+            except BaseException:
+                self.governor.discard()
+                raise
+            else:
+                self.governor.release(started, res.status_code, url)
+                if res.status_code in RETRY_STATUSES:
+                    tracer.count("http.throttled")
+                if res.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    if tracer.enabled:
+                        tracer.count("http.requests")
+                        tracer.count("http.bytes", len(res.content))
+                    return res
+                retry_after = res.headers.get("Retry-After")
+                res.close()
+            time.sleep(self._backoff(attempt, retry_after))
+
+    def get_bytes(self, url):
+        res = self.get(url)
+        res.raise_for_status()
+        return res.content
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+# Singleton instance
+transport = Transport(
+    connect_timeout=_env_float("PKMNCLI_CONNECT_TIMEOUT", 3.05),
+    read_timeout=_env_float("PKMNCLI_READ_TIMEOUT", 15),
+    retries=int(_env_float("PKMNCLI_RETRIES", 3)),
+)
@@ -0,0 +1,137 @@
+import functools
+import io
+import os
+import sys
+import tarfile
+import threading
+import time
+import zipfile
+
+
+class CardWriter:
+    """Destination for encoded cards; `write(filename, data)` returns where the card went.
+
+    Writers are context managers and may be written to from several threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def write(self, filename, data):
+        with self._lock:
+            return self._write(filename, data)
+
+    def _write(self, filename, data):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class DirectoryWriter(CardWriter):
+    """One file per card; the directory is created on the first write."""
+
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+
+    def _write(self, filename, data):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, filename)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+
+class StreamWriter(CardWriter):
+    """Cards back to back on a binary stream (PNG and WebP files are self-delimiting)."""
+
+    def __init__(self, fp):
+        super().__init__()
+        self.fp = fp
+
+    def _write(self, filename, data):
+        self.fp.write(data)
+        return filename
+
+    def close(self):
+        self.fp.flush()
+
+
+class _ArchiveWriter(CardWriter):
+    def __init__(self, target):
+        super().__init__()
+        # Accept a path or an already open binary file object
+        self._owned = isinstance(target, (str, os.PathLike))
+        self.fp = open(target, "wb") if self._owned else target
+        self.name = os.fspath(target) if self._owned else getattr(target, "name", "archive")
+
+    def close(self):
+        self._close_archive()
+        if self._owned:
+            self.fp.close()
+        else:
+            self.fp.flush()
+
+
+class TarWriter(_ArchiveWriter):
+    """A tar archive written as a stream (works on pipes); gzip-compressed with `compress`."""
+
+    def __init__(self, target, compress=False):
+        super().__init__(target)
+        self._tar = tarfile.open(fileobj=self.fp, mode="w|gz" if compress else "w|")
+
+    def _write(self, filename, data):
+        info = tarfile.TarInfo(filename)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self._tar.addfile(info, io.BytesIO(data))
+        return f"{self.name}:{filename}"
+
+    def _close_archive(self):
+        self._tar.close()
+
+
+class ZipWriter(_ArchiveWriter):
+    """A zip archive; cards are stored as-is since PNG and WebP are already compressed."""
+
+    def __init__(self, target):
+        super().__init__(target)
+        self._zip = zipfile.ZipFile(self.fp, "w", zipfile.ZIP_STORED)
+
+    def _write(self, filename, data):
+        self._zip.writestr(zipfile.ZipInfo(filename, time.localtime()[:6]), data)
+        return f"{self.name}:{filename}"
+
+    def _close_archive(self):
+        self._zip.close()
+
+
+ARCHIVES = {"tar": TarWriter, "tgz": functools.partial(TarWriter, compress=True), "zip": ZipWriter}
+
+
+def open_writer(target):
+    """A writer for `target`: "-" (raw cards on stdout), a .tar/.tar.gz/.tgz/.zip path, or a directory.
+
+    "tar:-", "tgz:-" and "zip:-" stream an archive to stdout instead.
+    """
+    kind, _, path = target.partition(":")
+    if kind in ARCHIVES and path:
+        return ARCHIVES[kind](sys.stdout.buffer if path == "-" else path)
+    if target == "-":
+        return StreamWriter(sys.stdout.buffer)
+    lowered = target.lower()
+    if lowered.endswith((".tar.gz", ".tgz")):
+        return TarWriter(target, compress=True)
+    if lowered.endswith(".tar"):
+        return TarWriter(target)
+    if lowered.endswith(".zip"):
+        return ZipWriter(target)
+    return DirectoryWriter(target)
@@ -0,0 +1,79 @@
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+# Keep the package's singletons (sprite store, dex store) out of the real cache
+os.environ["PKMNCLI_CACHE_DIR"] = tempfile.mkdtemp(prefix="pkmncli-test-")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from fixture_server import Dex, FixtureServer  # noqa: E402
+from pokedex.api import PokeAPI  # noqa: E402
+from pokedex.cache import ResponseCache  # noqa: E402
+from pokedex.store import DexStore  # noqa: E402
+
+
+class PartialSyncTest(unittest.TestCase):
+    """A sync interrupted after the pokemon stage leaves pokemon rows without species."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FixtureServer(Dex.synthetic(6)).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = DexStore(os.path.join(self.tmp.name, "dex.sqlite3"))
+        self.store.sync(self.server.api_url + "pokemon?limit=100000", concurrency=4)
+        conn = self.store._connection()
+        conn.execute("DELETE FROM species")
+        conn.commit()
+        self.api = PokeAPI(cache=ResponseCache(os.path.join(self.tmp.name, "responses")), store=self.store)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fetch_pokemon_fetches_missing_species(self):
+        data, species = self.api.fetch_pokemon("2")
+        self.assertEqual(data["id"], 2)
+        self.assertIsNotNone(species)
+        self.assertEqual(species["growth_rate"], self.server.dex.species[2]["growth_rate"])
+
+    def test_family_follows_chain_of_missing_species(self):
+        stages = asyncio.run(self.api.fetch_family("2"))
+        self.assertEqual([[bundle[0]["id"] for bundle in stage] for stage in stages], [[1], [2], [3]])
+        self.assertTrue(all(bundle[1] is not None for stage in stages for bundle in stage))
+
+
+class RevalidationTest(unittest.TestCase):
+    """Stale entries served by a one-shot process are still refreshed before it exits."""
+
+    def test_stale_entry_refreshed_by_one_shot_call(self):
+        with FixtureServer(Dex.synthetic(3)) as server, tempfile.TemporaryDirectory() as cache_dir:
+            url = server.api_url + "pokemon/1"
+            cache = ResponseCache(os.path.join(cache_dir, "responses"))
+            cache.put(url, {"name": "stale"}, etag='"old"')
+            entry = cache.get(url)
+            entry["fetched_at"] -= 8 * 24 * 60 * 60
+            cache._write(url, entry)
+
+            env = dict(os.environ, PKMNCLI_CACHE_DIR=cache_dir, PKMNCLI_API_URL=server.api_url)
+            script = f"from pokedex.api import pokeapi; print(pokeapi.get_json({url!r})['name'])"
+            result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True,
+                                    cwd=os.path.join(os.path.dirname(__file__), ".."), check=True)
+
+            self.assertEqual(result.stdout.strip(), "stale")
+            refreshed = cache.get(url)
+            self.assertLess(time.time() - refreshed["fetched_at"], 60)
+            self.assertEqual(refreshed["body"]["name"], server.dex.pokemon[1]["name"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import random
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pokedex.governor import Governor  # noqa: E402
+
+POKEMON_URL = "https://pokeapi.co/api/v2/pokemon/{}/"
+SPRITE_URL = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{}.png"
+
+
+class GovernorTest(unittest.TestCase):
+    def healthy_mix(self, governor, rounds=400):
+        """Healthy traffic from 8 workers mixing slow JSON, fast sprites and faster 304s; lowest window seen."""
+        rng = random.Random(0)
+        lowest = governor.limit
+        for i in range(rounds):
+            started = [governor.acquire() for _ in range(min(8, int(governor.limit)))]
+            for n, _ in enumerate(started):
+                kind = (i + n) % 3
+                if kind == 0:
+                    latency, status, url = rng.uniform(0.10, 0.14), 200, POKEMON_URL.format(i)
+                elif kind == 1:
+                    latency, status, url = rng.uniform(0.012, 0.018), 200, SPRITE_URL.format(i)
+                else:
+                    latency, status, url = rng.uniform(0.008, 0.012), 304, POKEMON_URL.format(i)
+                governor.release(time.monotonic() - latency, status, url)
+                lowest = min(lowest, governor.limit)
+        return lowest
+
+    def test_mixed_healthy_latencies_do_not_shrink_window(self):
+        governor = Governor(initial_limit=4, max_limit=16)
+        self.assertEqual(self.healthy_mix(governor), 4)
+        self.assertEqual(int(governor.limit), 16)
+
+    def test_throttling_still_shrinks_window(self):
+        governor = Governor(initial_limit=8, max_limit=16)
+        governor.release(governor.acquire(), 429, POKEMON_URL.format(1))
+        self.assertEqual(governor.limit, 4)
+        self.assertEqual(governor.stats()["throttled"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
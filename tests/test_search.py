@@ -0,0 +1,53 @@
+import difflib
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from fixture_server import Dex  # noqa: E402
+from pokedex.search import NameIndex  # noqa: E402
+
+
+def typo(rng, name):
+    i = rng.randrange(len(name))
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    edits = (name[:i] + name[i + 1:], name[:i] + letter + name[i:], name[:i] + letter + name[i + 1:],
+             name[:i] + name[i + 1:i + 2] + name[i:i + 1] + name[i + 2:])
+    return rng.choice(edits) or name
+
+
+class NearMissTest(unittest.TestCase):
+    """The index must return exactly what a difflib.get_close_matches scan would."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Synthetic names are recombined syllables: a dense set full of near misses
+        cls.names = list(dict.fromkeys(p["name"] for p in Dex.synthetic(1010).pokemon.values()))
+        cls.index = NameIndex(cls.names)
+
+    def assertMatchesDifflib(self, query, k):
+        expected = difflib.get_close_matches(query, self.names, n=k, cutoff=0.6)
+        self.assertEqual([name for name, _ in self.index.search(query, k=k)], expected, query)
+
+    def test_transposed_letters(self):
+        # Queries whose best match shares few trigrams with them
+        for query in ("amkamo", "decder", "rayagr", "amoedr", "kaedr", "tynagr", "eeviro"):
+            self.assertMatchesDifflib(query, 1)
+            self.assertMatchesDifflib(query, 5)
+
+    def test_random_typos(self):
+        rng = random.Random(7)
+        for name in rng.sample(self.names, 300):
+            self.assertMatchesDifflib(typo(rng, name), 5)
+
+    def test_exact_name(self):
+        name = self.names[0]
+        self.assertEqual(self.index.best(name), name)
+        self.assertEqual(self.index.search(name, k=3)[0], (name, 1.0))
+
+
+if __name__ == "__main__":
+    unittest.main()